@@ -0,0 +1,31 @@
+"""Add query embedding cache table
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 09:12:41.532104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('query_embedding',
+    sa.Column('query', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('embedding', Vector(384), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('query', 'model')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('query_embedding')
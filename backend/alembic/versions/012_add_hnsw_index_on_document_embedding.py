@@ -0,0 +1,36 @@
+"""Add HNSW index on document embedding
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18 10:03:17.218450
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The ORM declared an untyped vector, HNSW needs the dimension on the column
+    op.execute('ALTER TABLE document ALTER COLUMN embedding TYPE vector(384) USING embedding::vector(384)')
+    op.create_index(
+        'ix_document_embedding_hnsw',
+        'document',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_embedding_hnsw', table_name='document')
+    op.alter_column('document', 'embedding', type_=Vector(), existing_nullable=True)
@@ -0,0 +1,31 @@
+"""Add full text search vector to document
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 11:26:54.904127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE document ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+        ) STORED
+    """)
+    op.create_index('ix_document_search_vector', 'document', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_search_vector', table_name='document')
+    op.drop_column('document', 'search_vector')
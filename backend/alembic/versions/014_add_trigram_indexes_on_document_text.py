@@ -0,0 +1,33 @@
+"""Add trigram indexes on document title and summary
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18 12:08:31.640275
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_document_title_trgm', 'document', ['title'], unique=False,
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_document_summary_trgm', 'document', ['summary'], unique=False,
+        postgresql_using='gin', postgresql_ops={'summary': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_summary_trgm', table_name='document')
+    op.drop_index('ix_document_title_trgm', table_name='document')
@@ -0,0 +1,39 @@
+"""Add primary key and reverse index to document_tags
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18 12:47:09.115382
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop incomplete links and keep one row of each duplicated pair
+    op.execute('DELETE FROM document_tags WHERE document_id IS NULL OR tag_id IS NULL')
+    op.execute("""
+        DELETE FROM document_tags a
+        USING document_tags b
+        WHERE a.ctid < b.ctid
+          AND a.document_id = b.document_id
+          AND a.tag_id = b.tag_id
+    """)
+    op.alter_column('document_tags', 'document_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('document_tags', 'tag_id', existing_type=sa.Integer(), nullable=False)
+    op.create_primary_key('document_tags_pkey', 'document_tags', ['document_id', 'tag_id'])
+    op.create_index('ix_document_tags_tag_id_document_id', 'document_tags', ['tag_id', 'document_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_tags_tag_id_document_id', table_name='document_tags')
+    op.drop_constraint('document_tags_pkey', 'document_tags', type_='primary')
+    op.alter_column('document_tags', 'tag_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('document_tags', 'document_id', existing_type=sa.Integer(), nullable=True)
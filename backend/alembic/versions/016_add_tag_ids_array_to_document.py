@@ -0,0 +1,39 @@
+"""Add denormalized tag_ids array to document
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18 13:31:52.770841
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('document', sa.Column(
+        'tag_ids', postgresql.ARRAY(sa.Integer()), nullable=False, server_default='{}'
+    ))
+    op.execute("""
+        UPDATE document
+        SET tag_ids = links.tag_ids
+        FROM (
+            SELECT document_id, array_agg(tag_id ORDER BY tag_id) AS tag_ids
+            FROM document_tags
+            GROUP BY document_id
+        ) AS links
+        WHERE document.id = links.document_id
+    """)
+    op.create_index('ix_document_tag_ids', 'document', ['tag_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_tag_ids', table_name='document')
+    op.drop_column('document', 'tag_ids')
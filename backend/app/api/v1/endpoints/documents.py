@@ -1,45 +1,119 @@
 from app.models.document import ResourceType
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ....schemas import Document, DocumentCreate, DocumentUpdate
+from ....schemas import Document, DocumentCreate, DocumentUpdate, TagMatch
+from ....schemas.tag import Tag
 from ....crud import crud_document
-from ....deps import get_db
+from ....crud.crud_document import SPARSE_FIELDS
+from ....core.cursor import encode_cursor, decode_cursor
+from ....deps import get_db, get_current_active_superuser
+from ....services.bulk_import import (
+    detect_format, import_running, import_status, run_import, spool_upload, FORMATS
+)
+from ....services.document_export import export_documents, check_export_format, EXPORT_FORMATS
+from ....core.config import settings
 
 router = APIRouter()
 
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated `fields=` value and check it against SPARSE_FIELDS."""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in SPARSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(SPARSE_FIELDS)}"
+        )
+    return requested
+
+def _sparse_response(documents, fields: List[str]) -> JSONResponse:
+    """Serialize only the requested fields, without touching unloaded columns."""
+    rows = []
+    for document in documents:
+        row = {field: getattr(document, field) for field in fields if field != "tags"}
+        if "tags" in fields:
+            row["tags"] = [Tag.model_validate(tag) for tag in document.tags]
+        rows.append(row)
+    return JSONResponse(content=jsonable_encoder(rows))
+
+def _after_id(cursor: Optional[str]) -> Optional[int]:
+    """Last document id of the previous page, from an `X-Next-Cursor` value."""
+    if not cursor:
+        return None
+    try:
+        after_id = decode_cursor(cursor).get("id")
+    except ValueError:
+        after_id = None
+    if not isinstance(after_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
+
+def _page_response(response: Response, documents, limit: int, fields: Optional[List[str]]):
+    """Trim the look-ahead row and put the next page's cursor in `X-Next-Cursor`."""
+    next_cursor = encode_cursor({"id": documents[limit - 1].id}) if len(documents) > limit else None
+    documents = documents[:limit]
+    if fields:
+        response = _sparse_response(documents, fields)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response if fields else documents
+
 @router.get("/", response_model=List[Document])
 def get_documents(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     region: Optional[str] = None,
     topic: Optional[str] = None,
     year: Optional[int] = None,
     search: Optional[str] = None,
-    resource_type: Optional[ResourceType] = None
+    resource_type: Optional[ResourceType] = None,
+    tag: List[str] = Query(default=[]),
+    tag_match: TagMatch = TagMatch.ALL,
+    fields: Optional[str] = None
 ):
     """
-    Retrieve documents with optional filtering.
+    Retrieve documents with optional filtering, newest first.
+
+    When another page exists its cursor is returned in the `X-Next-Cursor`
+    header; pass it back as `cursor=` to fetch that page at constant cost.
+    `skip` is still accepted.
     
     Examples:
         /api/v1/documents/?region=Uganda
         /api/v1/documents/?topic=Adoption&year=2023
+        /api/v1/documents/?tag=LPG&tag=Adoption
+        /api/v1/documents/?tag=LPG&tag=Ethanol&tag_match=any
         /api/v1/documents/?search=clean%20cooking
         /api/v1/documents/?region=Uganda&limit=5&skip=10
+        /api/v1/documents/?fields=id,title,tags
+        /api/v1/documents/?limit=20&cursor=eyJpZCI6MTIzNH0
     """
+    field_list = _parse_fields(fields)
+    after_id = _after_id(cursor)
     try:
         documents = crud_document.get_multi(
             db,
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             region=region,
             topic=topic,
             year=year,
             search_term=search,
-            resource_type=resource_type
+            resource_type=resource_type,
+            tags=tag,
+            tag_match=tag_match,
+            fields=field_list,
+            after_id=after_id
         )
-        return documents
+        return _page_response(response, documents, limit, field_list)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -57,6 +131,77 @@ def get_year_range(
         "max_year": max_year
     }
 
+@router.post("/import", response_model=dict, status_code=202)
+def import_documents(
+    *,
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_current_active_superuser),
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=f"^({'|'.join(FORMATS)})$"),
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=5000)
+):
+    """
+    Bulk import documents from a CSV, TSV or JSONL upload (superusers only).
+
+    The upload is stored and imported in the background; poll
+    `GET /import/{name}` with the file name for its progress. Rows are
+    upserted on source_url in chunks. If an import of the same file was
+    interrupted, uploading it again resumes after the last committed chunk.
+    """
+    name = file.filename or "upload"
+    try:
+        fmt = format or detect_format(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if import_running(name):
+        raise HTTPException(status_code=409, detail=f"An import of {name} is already running")
+    path = spool_upload(file.file, name=name)
+    background_tasks.add_task(run_import, path, name=name, size=file.size, fmt=fmt, chunk_size=chunk_size)
+    return {"status": "queued", "name": name, "source": f"{name}:{file.size}"}
+
+@router.get("/import/{name}", response_model=dict)
+def get_import_status(
+    name: str,
+    current_user = Depends(get_current_active_superuser)
+):
+    """
+    Status of the latest import of an uploaded file: "running" with the
+    records committed so far, "done" with the final counts, "failed" with
+    the error, or "interrupted" if the worker running it stopped.
+    """
+    status = import_status(name)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"No import of {name} found")
+    return status
+
+@router.get("/export")
+def export_library(
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    include_embeddings: bool = False
+):
+    """
+    Stream every document as NDJSON, CSV or Parquet (Parquet needs pyarrow).
+
+    Tags are a list of names (";"-separated in CSV). With
+    `include_embeddings=true` each row also carries its embedding as
+    little-endian float32 bytes, base64-encoded in NDJSON and CSV.
+
+    Examples:
+        /api/v1/documents/export
+        /api/v1/documents/export?format=csv
+        /api/v1/documents/export?format=parquet&include_embeddings=true
+    """
+    try:
+        check_export_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_documents(format, include_embeddings=include_embeddings),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="documents.{extension}"'}
+    )
+
 @router.get("/{document_id}", response_model=Document)
 def get_document(
     document_id: int,
@@ -105,13 +250,21 @@ def update_document(
 @router.get("/framework/{framework}", response_model=List[Document])
 def get_documents_by_framework(
     framework: str,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
     """
     Get documents filtered by framework category.
+
+    Paginated like `/documents/`: follow `X-Next-Cursor` with `cursor=`.
+    `fields=id,title` returns only the listed fields.
     """
+    field_list = _parse_fields(fields)
+    after_id = _after_id(cursor)
     try:
         # Convert framework path parameter to category
         framework_category = framework.replace('-', '_').upper()
@@ -120,9 +273,11 @@ def get_documents_by_framework(
             db, 
             framework=framework_category,
             skip=skip,
-            limit=limit
+            limit=limit + 1,
+            fields=field_list,
+            after_id=after_id
         )
-        return documents
+        return _page_response(response, documents, limit, field_list)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -34,13 +34,31 @@ async def search_documents(
             query=search_query.query,
             limit=search_query.limit or 10,
             include_external=settings.INCLUDE_EXTERNAL,
+            filters=search_query.filters,
+            ef_search=search_query.ef_search,
+            latency_budget_ms=search_query.latency_budget_ms,
+            cursor=search_query.cursor,
         )
         
         return results
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
     except Exception as e:
         logger.exception("Search error occurred")
         raise HTTPException(
             status_code=500,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+@router.get("/cache", response_model=dict)
+def get_query_cache_stats():
+    """
+    Hit/miss counters and size of the query-embedding cache.
+    """
+    return search_service.query_cache.stats()
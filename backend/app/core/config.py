@@ -20,6 +20,56 @@ class Settings(BaseSettings):
     PERPLEXITY_API_KEY: Optional[str] = None
     GOOGLE_SE_API_KEY: Optional[str] = None
     SE_ID: Optional[str] = None    
+
+    # embedding model setup variables
+    EMBEDDING_MODEL_NAME: str = "thenlper/gte-small"
+    EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_POOL_KIND: str = "thread"  # "thread" or "process"
+    EMBEDDING_POOL_SIZE: int = 2
+    EMBEDDING_QUEUE_SIZE: int = 64  # max encode calls in flight per worker
+    EMBEDDING_BACKEND: str = "torch"  # "torch", "onnx" or "onnx-int8"
+    EMBEDDING_ONNX_DIR: str = "models/gte-small-onnx"  # output of `python -m app.services.embedding_backends`
+    TORCH_NUM_THREADS: Optional[int] = None  # intra-op threads for torch or ONNX Runtime, None keeps the default
+    EMBEDDING_BATCH_MAX_SIZE: int = 32  # max query texts coalesced into one encode
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0  # how long a query waits for others to join its batch
+
+    # hybrid search setup variables
+    HYBRID_SEARCH: bool = True  # fuse Postgres full-text results with the vector results
+    HYBRID_CANDIDATES: int = 50  # results taken from each retriever before fusion
+    HYBRID_RRF_K: int = 60  # reciprocal rank fusion constant
+    SEARCH_LATENCY_BUDGET_MS: int = 2000  # default time allowed for retrieval once the query is embedded
+
+    # vector index setup variables
+    SEARCH_BACKEND: str = "pgvector"  # "pgvector" or "memory" (memory-mapped in-process index)
+    VECTOR_INDEX_EF_SEARCH: int = 40  # HNSW candidate list size, higher trades latency for recall
+    VECTOR_INDEX_ITERATIVE_SCAN: Optional[str] = "strict_order"  # hnsw.iterative_scan for filtered searches, used only on pgvector >= 0.8, None to disable
+    VECTOR_INDEX_FILTERED_EF_SEARCH: int = 200  # ef_search for filtered searches without iterative scan; short pages are re-ranked exactly
+    VECTOR_INDEX_PATH: str = "vector_index"  # directory of the memory-mapped index files
+    VECTOR_INDEX_REFRESH_SECONDS: float = 30.0  # how often to pull documents changed since the last refresh
+    VECTOR_INDEX_MAX_DELTA: int = 5000  # changed documents held in memory before the file is rewritten
+    VECTOR_INDEX_REFRESH_OVERLAP: float = 60.0  # seconds before the watermark re-read by each refresh, longer than any write transaction
+
+    # query embedding cache setup variables
+    QUERY_CACHE_SIZE: int = 10000
+    QUERY_CACHE_TTL: int = 60 * 60 * 24 * 7  # 7 days
+    QUERY_CACHE_PERSIST: Optional[str] = None  # None, "file" or "postgres"
+    QUERY_CACHE_PATH: str = "query_embedding_cache.npz"
+    QUERY_CACHE_FLUSH_EVERY: int = 50  # new entries buffered before they are persisted
+
+    # external result tagging setup variables
+    TAG_MATCH_THRESHOLD: float = 0.8  # min cosine similarity between a result summary and a tag
+    TAG_MATRIX_TTL: float = 300.0  # seconds before the cached tag matrix is rebuilt regardless
+
+    # bulk import setup variables
+    IMPORT_CHUNK_SIZE: int = 500  # rows embedded and upserted per transaction
+    IMPORT_CHECKPOINT_DIR: str = "import_checkpoints"  # resume points of interrupted imports
+
+    # web server setup variables (gunicorn.conf.py)
+    WEB_CONCURRENCY: int = 2 * (os.cpu_count() or 1) + 1  # forked workers; set TORCH_NUM_THREADS to about cores / workers
+    WEB_BIND: str = "0.0.0.0:8000"
+    WEB_TIMEOUT: int = 120  # seconds a worker may be silent before it is restarted
+    WEB_GRACEFUL_TIMEOUT: int = 30  # seconds workers get to finish requests on reload or shutdown
     
     # autosaving docs setup variables
     VITE_AUTOSAVE_DOCS: bool = False
@@ -1,22 +1,38 @@
 import logging
-from typing import List, Optional, Dict
-from app.crud import crud_tag, crud_document
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import re
+from datetime import datetime
+from typing import Any, List, Optional, Dict
+from sqlalchemy.orm import Session, selectinload, load_only
+from sqlalchemy import or_, exists, false, any_, bindparam, cast, delete, select, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
 from app.crud.base import CRUDBase
-from app.models.document import Document, ResourceType
+from app.models.document import Document, ResourceType, document_tags
 from app.models.tag import Tag, TagCategory
 from app.schemas.document import DocumentCreate, DocumentUpdate
-from app.services.search_service import search_service
+from app.schemas.search import SearchFilters, TagMatch
+from app.core.config import settings
 from sqlalchemy.sql import func
 from sqlalchemy.sql import text
 
-from sqlalchemy.exc import IntegrityError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields a client may request with a sparse fieldset, as named in the Document schema
+SPARSE_FIELDS = ('id', 'title', 'summary', 'source_url', 'year_published', 'resource_type', 'created_at', 'updated_at', 'tags')
+# pgvector rejects a larger hnsw.ef_search
+HNSW_MAX_EF_SEARCH = 1000
+
+def _embedding_engine():
+    # Imported on first write so that reading documents, and Alembic, never load the services
+    from app.services.embedding_engine import embedding_engine
+    return embedding_engine
+
 class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
+    # (major, minor, patch) of the installed pgvector, read once per process
+    _pgvector_version: Optional[tuple] = None
+
     def _guess_tag_category(self, tag_name: str) -> TagCategory:
         """Guess the category of a tag based on predefined rules."""
         regions = {'Sub-Saharan Africa', 'North America', 'Latin America and Caribbean', 'South Asia', 'Europe', 'Global', 'East Asia and Pacific'}
@@ -83,74 +99,176 @@ class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
     #     return db_obj
 
     def create(self, db: Session, *, obj_in: DocumentCreate) -> Document:
-        """Create a new document with tags and generate embedding."""
-        logger.info(f"The obj_in for document create: {obj_in}")
-        existing_doc = self.get_by_title(db, title=obj_in.title)
-        if not existing_doc:
-            
-            logger.info(f"Creating new document: {obj_in}")
-            
-            # Check if resource_type is valid
-            if obj_in.resource_type not in ResourceType.__members__.values():
-                logger.info(f"Invalid resource type: {obj_in.resource_type}")
-                resource_type = None
-            else:
-                resource_type = obj_in.resource_type
-
-            
-            db_obj = Document(
-                title=obj_in.title,
-                summary=obj_in.summary,
-                source_url=obj_in.source_url,
-                year_published=obj_in.year_published,
-                resource_type=resource_type,
-            )
+        """Create or update (by source_url) a document with tags and embedding.
+
+        Tags are resolved with one SELECT and missing ones inserted with one
+        INSERT ... ON CONFLICT DO NOTHING; the document is upserted on
+        source_url and its tag links replaced, all in a single transaction.
+        """
+        logger.info(f"Creating document: {obj_in}")
+
+        # Check if resource_type is valid
+        if obj_in.resource_type not in ResourceType.__members__.values():
+            logger.info(f"Invalid resource type: {obj_in.resource_type}")
+            resource_type = None
+        else:
+            resource_type = obj_in.resource_type
+
+        # Embed before any INSERT, so new tag rows do not hold their unique-index
+        # locks, blocking concurrent creates with the same tags, during the forward pass
+        embedding = None
+        tag_names = list(dict.fromkeys(tag_in.name for tag_in in obj_in.tags or [] if tag_in.name))
+        metadata_text = self._metadata_text(obj_in.title, obj_in.summary, obj_in.year_published, tag_names)
+        try:
+            embedding = _embedding_engine().encode_one(metadata_text)
+        except Exception as e:
+            print(f"Warning: Failed to generate embedding: {str(e)}")
+            # Continue without embedding - it can be generated during search
 
-            # Handle tags
-            if obj_in.tags:
-                tags = []
-                new_tags = []
-                for tag_in in obj_in.tags:
-                    existing_tag = crud_tag.tag.get_by_name(db, name=tag_in.name)
-                    if existing_tag:
-                        tags.append(existing_tag)
-                    else:
-                        if tag_in.name:
-                            new_tags.append(tag_in)
-
-                # Batch process new tags
-                if new_tags:
-                    tag_names = [tag.name for tag in new_tags]
-                    embeddings = [search_service._get_embedding(tag_name) for tag_name in tag_names]
-                    for tag_in, embedding in zip(new_tags, embeddings):
-                        # logger.info(f"Generated embedding for tag '{tag_in.name}': {embedding}")
-                        try:
-                            if tag_in.name:
-                                new_tag = Tag(name=tag_in.name, category=tag_in.category, embedding=embedding)
-                                db.add(new_tag)
-                                db.commit()
-                                tags.append(new_tag)
-                        except IntegrityError:
-                            db.rollback()
-                            existing_tag = crud_tag.tag.get_by_name(db, name=tag_in.name)
-                            if existing_tag:
-                                tags.append(existing_tag)
-
-            db_obj.tags = tags
-
-            # Generate and store embedding
-            metadata_text = self._create_metadata_text(db_obj)
-            try:
-                embedding = search_service._get_embedding(metadata_text)
-                db_obj.embedding = embedding
-            except Exception as e:
-                print(f"Warning: Failed to generate embedding: {str(e)}")
-                # Continue without embedding - it can be generated during search
-
-            db.add(db_obj)
+        try:
+            tags = self._resolve_tags(db, obj_in.tags or [])
+            tag_ids = sorted(set(tags.values()))
+
+            values = {
+                "title": obj_in.title,
+                "summary": obj_in.summary,
+                "year_published": obj_in.year_published,
+                "resource_type": resource_type,
+                "tag_ids": tag_ids,
+            }
+            if embedding is not None:
+                values["embedding"] = embedding
+            document_id = db.execute(
+                insert(Document)
+                .values(source_url=obj_in.source_url, **values)
+                .on_conflict_do_update(
+                    index_elements=[Document.source_url],
+                    set_={**values, "updated_at": datetime.utcnow()}
+                )
+                .returning(Document.id)
+            ).scalar_one()
+            self._replace_tag_links(db, document_id, tag_ids)
             db.commit()
-            db.refresh(db_obj)
-            return db_obj
+        except Exception:
+            db.rollback()
+            raise
+        return self.get(db, id=document_id)
+
+    def bulk_upsert(self, db: Session, *, documents_in: List[DocumentCreate]) -> int:
+        """Upsert many documents on source_url with a fixed number of statements.
+
+        Tags of all documents are resolved together, document embeddings are
+        computed in one batch, documents are written with one multi-row
+        INSERT ... ON CONFLICT (source_url) DO UPDATE and their tag links
+        replaced. The caller commits. Returns the number of rows written.
+        """
+        # A row may only be upserted once per statement, the last one wins
+        documents_in = list({document_in.source_url: document_in for document_in in documents_in}.values())
+        if not documents_in:
+            return 0
+        # Embedded before the tags are inserted, as in create()
+        texts = [
+            self._metadata_text(
+                document_in.title, document_in.summary, document_in.year_published,
+                list(dict.fromkeys(tag_in.name for tag_in in document_in.tags or [] if tag_in.name))
+            )
+            for document_in in documents_in
+        ]
+        embeddings = _embedding_engine().encode_many(texts)
+        tag_ids_by_name = self._resolve_tags(db, [tag_in for document_in in documents_in for tag_in in document_in.tags or []])
+
+        rows, links = [], {}
+        for document_in in documents_in:
+            tag_names = [tag_in.name for tag_in in document_in.tags or [] if tag_in.name in tag_ids_by_name]
+            links[document_in.source_url] = sorted({tag_ids_by_name[name] for name in tag_names})
+            resource_type = document_in.resource_type if document_in.resource_type in ResourceType.__members__.values() else None
+            rows.append({
+                "title": document_in.title,
+                "summary": document_in.summary,
+                "source_url": document_in.source_url,
+                "year_published": document_in.year_published,
+                "resource_type": resource_type,
+                "tag_ids": links[document_in.source_url],
+            })
+        for row, embedding in zip(rows, embeddings):
+            row["embedding"] = embedding.tolist()
+
+        stmt = insert(Document).values(rows)
+        written = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Document.source_url],
+                set_={
+                    "title": stmt.excluded.title,
+                    "summary": stmt.excluded.summary,
+                    "year_published": stmt.excluded.year_published,
+                    "resource_type": stmt.excluded.resource_type,
+                    "tag_ids": stmt.excluded.tag_ids,
+                    "embedding": stmt.excluded.embedding,
+                    "updated_at": datetime.utcnow(),
+                }
+            ).returning(Document.id, Document.source_url)
+        ).all()
+
+        document_ids = [document_id for document_id, _ in written]
+        db.execute(delete(document_tags).where(document_tags.c.document_id.in_(document_ids)))
+        link_rows = [
+            {"document_id": document_id, "tag_id": tag_id}
+            for document_id, source_url in written for tag_id in links[source_url]
+        ]
+        if link_rows:
+            db.execute(insert(document_tags).values(link_rows).on_conflict_do_nothing())
+        return len(written)
+
+    def _resolve_tags(self, db: Session, tags_in) -> Dict[str, int]:
+        """Map tag names to ids, inserting the missing tags with their embeddings."""
+        categories = {}
+        for tag_in in tags_in:
+            if tag_in.name and tag_in.name not in categories:
+                categories[tag_in.name] = tag_in.category
+        if not categories:
+            return {}
+        names = list(categories)
+        found = dict(
+            db.query(Tag.name, Tag.id)
+            .filter(Tag.name == any_(bindparam("names", names, type_=postgresql.ARRAY(String))))
+            .all()
+        )
+
+        missing = [name for name in names if name not in found]
+        if missing:
+            embeddings = _embedding_engine().encode_many(missing)
+            rows = [
+                {
+                    "name": name,
+                    "category": TagCategory(categories[name].value) if categories[name] else self._guess_tag_category(name),
+                    "embedding": embedding.tolist(),
+                }
+                for name, embedding in zip(missing, embeddings)
+            ]
+            inserted = db.execute(
+                insert(Tag).values(rows).on_conflict_do_nothing(index_elements=[Tag.name]).returning(Tag.name, Tag.id)
+            ).all()
+            found.update(dict(inserted))
+            # Names inserted concurrently by another transaction since the SELECT
+            raced = [name for name in missing if name not in found]
+            if raced:
+                found.update(dict(db.query(Tag.name, Tag.id).filter(Tag.name.in_(raced)).all()))
+        return {name: found[name] for name in names if name in found}
+
+    def _replace_tag_links(self, db: Session, document_id: int, tag_ids: List[int]) -> None:
+        """Make document_tags hold exactly `tag_ids` for the document."""
+        db.execute(
+            delete(document_tags).where(
+                document_tags.c.document_id == document_id,
+                document_tags.c.tag_id.notin_(tag_ids)
+            )
+        )
+        if tag_ids:
+            db.execute(
+                insert(document_tags)
+                .values([{"document_id": document_id, "tag_id": tag_id} for tag_id in tag_ids])
+                .on_conflict_do_nothing()
+            )
     
     def update(
         self,
@@ -162,37 +280,52 @@ class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
         """Update document and regenerate embedding if needed."""
         # Update basic fields
         update_data = obj_in.model_dump(exclude_unset=True)
-        tags_data = update_data.pop('tags', None)
+        update_data.pop('tags', None)
         
         # Update document fields
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
-        # Update tags if provided
-        if tags_data is not None:
-            tags = []
-            for tag_name in tags_data:
-                tag = db.query(Tag).filter(Tag.name == tag_name).first()
-                if not tag:
-                    category = self._guess_tag_category(tag_name)
-                    tag = Tag(name=tag_name, category=category)
-                    db.add(tag)
-                tags.append(tag)
-            db_obj.tags = tags
-
-        # Regenerate embedding since content changed
-        metadata_text = self._create_metadata_text(db_obj)
+        # Regenerate embedding since content changed, before new tags are inserted as in create()
+        if obj_in.tags is not None:
+            tag_names = list(dict.fromkeys(tag_in.name for tag_in in obj_in.tags if tag_in.name))
+        else:
+            tag_names = [tag.name for tag in db_obj.tags]
+        metadata_text = self._metadata_text(db_obj.title, db_obj.summary, db_obj.year_published, tag_names)
         try:
-            embedding = search_service._get_embedding(metadata_text)
+            embedding = _embedding_engine().encode_one(metadata_text)
             db_obj.embedding = embedding
         except Exception as e:
             print(f"Warning: Failed to regenerate embedding: {str(e)}")
 
+        # Update tags if provided
+        if obj_in.tags is not None:
+            tag_ids = list(self._resolve_tags(db, obj_in.tags).values())
+            db_obj.tags = db.query(Tag).filter(Tag.id.in_(tag_ids)).all() if tag_ids else []
+            self._sync_tag_ids(db, db_obj)
+
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def get(self, db: Session, id: Any) -> Optional[Document]:
+        return self._read_query(db).filter(Document.id == id).first()
+
+    def _read_query(self, db: Session, fields: Optional[List[str]] = None):
+        """Base query for documents returned to clients, tags loaded in one extra SELECT.
+
+        With `fields` (names from SPARSE_FIELDS) only those columns are selected
+        and tags are loaded only if requested.
+        """
+        if not fields:
+            return db.query(self.model).options(selectinload(Document.tags))
+        columns = [getattr(Document, field) for field in fields if field != 'tags']
+        options = [load_only(Document.id, *columns)]
+        if 'tags' in fields:
+            options.append(selectinload(Document.tags))
+        return db.query(self.model).options(*options)
+
     def get_multi(
         self,
         db: Session,
@@ -203,38 +336,101 @@ class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
         topic: Optional[str] = None,
         year: Optional[int] = None,
         search_term: Optional[str] = None,
-        resource_type: Optional[ResourceType] = None
+        resource_type: Optional[ResourceType] = None,
+        tags: Optional[List[str]] = None,
+        tag_match: TagMatch = TagMatch.ALL,
+        fields: Optional[List[str]] = None,
+        after_id: Optional[int] = None
     ) -> List[Document]:
-        query = db.query(self.model)
+        """Documents matching the filters, newest id first.
 
-        if region:
-            query = query.join(Document.tags).filter(
-                Tag.name == region,
-                Tag.category == TagCategory.REGION
-            )
+        Pass the last id of the previous page as `after_id` for keyset
+        pagination; `skip` still works but deep offsets scan every skipped row.
+        """
+        query = self._list_query(
+            db,
+            region=region,
+            topic=topic,
+            year=year,
+            search_term=search_term,
+            resource_type=resource_type,
+            tags=tags,
+            tag_match=tag_match,
+            fields=fields
+        )
+        return self._page(query, skip=skip, limit=limit, after_id=after_id)
 
-        if topic:
-            query = query.join(Document.tags).filter(
-                Tag.name == topic,
-                Tag.category == TagCategory.TOPIC
-            )
+    def _page(self, query, *, skip: int, limit: int, after_id: Optional[int]):
+        return self._paged_query(query, skip=skip, limit=limit, after_id=after_id).all()
+
+    def _paged_query(self, query, *, skip: int, limit: int, after_id: Optional[int]):
+        """Order by id descending, served backwards from the primary key index."""
+        if after_id is not None:
+            query = query.filter(Document.id < after_id)
+        return query.order_by(Document.id.desc()).offset(skip).limit(limit)
 
-        if year:
-            query = query.filter(Document.year_published == year)
+    def _list_query(
+        self,
+        db: Session,
+        *,
+        region: Optional[str] = None,
+        topic: Optional[str] = None,
+        year: Optional[int] = None,
+        search_term: Optional[str] = None,
+        resource_type: Optional[ResourceType] = None,
+        tags: Optional[List[str]] = None,
+        tag_match: TagMatch = TagMatch.ALL,
+        fields: Optional[List[str]] = None
+    ):
+        # Tag filters are array predicates on document.tag_ids rather than
+        # joins, so rows are never duplicated and no DISTINCT is needed.
+        filters = SearchFilters(
+            region=region,
+            topic=topic,
+            tags=tags or [],
+            tag_match=tag_match,
+            year=year,
+            resource_type=resource_type
+        )
+        query = self._read_query(db, fields).filter(*self._filter_conditions(db, filters))
 
         if search_term:
-            search_filter = or_(
-                Document.title.ilike(f"%{search_term}%"),
-                Document.summary.ilike(f"%{search_term}%")
-            )
-            query = query.filter(search_filter)
+            # Plain substring ILIKE on each column is what the pg_trgm GIN
+            # indexes serve; wildcards typed by the user are matched literally.
+            pattern = "%" + re.sub(r"([\\%_])", r"\\\1", search_term) + "%"
+            query = query.filter(or_(
+                Document.title.ilike(pattern, escape="\\"),
+                Document.summary.ilike(pattern, escape="\\")
+            ))
 
-        if resource_type:
-            query = query.filter(Document.resource_type == resource_type)
+        return query
 
-        query = query.offset(skip).limit(limit).distinct()
+    def export_query(self, *, include_embeddings: bool = False):
+        """Core SELECT of every document with its tag names aggregated in SQL.
 
-        return query.all()
+        Meant to be executed with `yield_per` so rows stream from a
+        server-side cursor instead of being loaded as ORM objects.
+        """
+        tag_names = (
+            select(func.array_agg(postgresql.aggregate_order_by(Tag.name, Tag.name)))
+            .select_from(document_tags.join(Tag, Tag.id == document_tags.c.tag_id))
+            .where(document_tags.c.document_id == Document.id)
+            .scalar_subquery()
+        )
+        columns = [
+            Document.id,
+            Document.title,
+            Document.summary,
+            Document.source_url,
+            Document.year_published,
+            Document.resource_type,
+            Document.created_at,
+            Document.updated_at,
+            func.coalesce(tag_names, cast(postgresql.array([]), postgresql.ARRAY(String))).label('tags'),
+        ]
+        if include_embeddings:
+            columns.append(Document.embedding)
+        return select(*columns).order_by(Document.id)
 
     def get_years_range(self, db: Session) -> tuple[int, int]:
         """Get the range of years in the documents."""
@@ -246,15 +442,97 @@ class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
     
     def get_by_title(self, db: Session, *, title: str) -> Optional[Document]:
         """Retrieve a document by its title."""
-        return db.query(Document).filter(Document.title == title).first()
+        return self._read_query(db).filter(Document.title == title).first()
     
+    def get_ids(self, db: Session, *, filters: SearchFilters) -> List[int]:
+        """Ids of all documents matching the filters."""
+        query = db.query(Document.id).filter(*self._filter_conditions(db, filters))
+        return [document_id for (document_id,) in query.all()]
+
+    def _has_tag(self, *criteria):
+        """EXISTS clause matching documents with a tag satisfying all criteria."""
+        return exists().where(
+            document_tags.c.document_id == Document.id,
+            document_tags.c.tag_id == Tag.id,
+            *criteria
+        )
+
+    def _sync_tag_ids(self, db: Session, db_obj: Document) -> None:
+        """Copy the document's tag links into its tag_ids array."""
+        if any(tag.id is None for tag in db_obj.tags):
+            db.flush()
+        db_obj.tag_ids = sorted({tag.id for tag in db_obj.tags})
+
+    def _tag_conditions(self, db: Session, filters: SearchFilters) -> list:
+        """Resolve tag-name filters to ids and compile them to tag_ids predicates.
+
+        Region, topic and `tag_match=all` tags become a single `@>` containment,
+        `tag_match=any` tags a single `&&` overlap, so the GIN index answers
+        any number of tags with one scan.
+        """
+        named = {
+            filters.region: TagCategory.REGION,
+            filters.topic: TagCategory.TOPIC,
+        }
+        names = set(filters.tags) | {name for name in named if name}
+        if not names:
+            return []
+        found = {name: (tag_id, category) for tag_id, name, category in
+                 db.query(Tag.id, Tag.name, Tag.category).filter(Tag.name.in_(names)).all()}
+
+        required = []
+        for name, category in named.items():
+            if not name:
+                continue
+            if name not in found or found[name][1] != category:
+                return [false()]
+            required.append(found[name][0])
+
+        conditions = []
+        if filters.tags and filters.tag_match == TagMatch.ANY:
+            any_ids = sorted(found[name][0] for name in set(filters.tags) if name in found)
+            if not any_ids:
+                return [false()]
+            conditions.append(Document.tag_ids.overlap(any_ids))
+        else:
+            if any(name not in found for name in filters.tags):
+                return [false()]
+            required += [found[name][0] for name in filters.tags]
+        if required:
+            conditions.insert(0, Document.tag_ids.contains(sorted(set(required))))
+        return conditions
+
+    def _filter_conditions(self, db: Session, filters: Optional[SearchFilters]) -> list:
+        """Translate search filters into WHERE clauses on the document table."""
+        if not filters:
+            return []
+        conditions = self._tag_conditions(db, filters)
+        if filters.category:
+            conditions.append(self._has_tag(Tag.category == TagCategory(filters.category.value)))
+        if filters.year:
+            conditions.append(Document.year_published == filters.year)
+        if filters.resource_type:
+            conditions.append(Document.resource_type == filters.resource_type)
+        return conditions
+
+    def get_by_ids(self, db: Session, *, ids: List[int]) -> List[Document]:
+        """Retrieve documents by id, in the order of `ids`, skipping missing ones."""
+        if not ids:
+            return []
+        documents = self._read_query(db).filter(Document.id.in_(ids)).all()
+        by_id = {document.id: document for document in documents}
+        return [by_id[document_id] for document_id in ids if document_id in by_id]
+
     def _create_metadata_text(self, doc: Document) -> str:
         """Create a text representation of document metadata for embedding."""
+        return self._metadata_text(doc.title, doc.summary, doc.year_published, [tag.name for tag in doc.tags])
+
+    def _metadata_text(self, title: str, summary: Optional[str], year_published: Optional[int], tag_names: List[str]) -> str:
         parts = [
-            f"Title: {doc.title}",
-            f"Summary: {doc.summary}" if doc.summary else "",
-            f"Year: {doc.year_published}" if doc.year_published else "",
-            f"Tags: {', '.join(tag.name for tag in doc.tags)}" if doc.tags else ""
+            f"Title: {title}",
+            f"Summary: {summary}" if summary else "",
+            f"Year: {year_published}" if year_published else "",
+            f"Tags: {', '.join(tag_names)}" if tag_names else ""
         ]
         return " ".join(filter(None, parts))
     
@@ -264,41 +542,142 @@ class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
         *, 
         framework: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        after_id: Optional[int] = None
     ) -> List[Document]:
-        """Get documents by framework category."""
-        query = db.query(self.model)
-        
-        # Filter by framework
-        query = query.join(Document.tags).filter(
-            Tag.category == framework
-        ).distinct()
-        
-        return query.offset(skip).limit(limit).all()
+        """Get documents by framework category, newest id first."""
+        query = self._read_query(db, fields).filter(self._has_tag(Tag.category == framework))
+        return self._page(query, skip=skip, limit=limit, after_id=after_id)
     
-    def get_by_text_embedding(
+    def get_ids_by_text_embedding(
         self,
         db: Session,
         *,
         query_embedding,
-        skip: int = 0,
         limit: int = 10,
+        filters: Optional[SearchFilters] = None,
+        ef_search: Optional[int] = None,
+        after: Optional[float] = None,
+        exclude_ids: Optional[List[int]] = None,
+        depth: int = 0
+    ) -> List[tuple]:
+        """(document id, cosine distance) pairs nearest to the embedding.
 
-    ):
-        query = (
-            db.query(
-                self.model,
-                func.cosine_distance(self.model.embedding, text(f"'{query_embedding}'::vector")).label('relevance_score')
+        `after` is the distance of the last row of the previous page; the
+        scan resumes there instead of re-ranking skipped rows, and the rows
+        already shown at that distance come in `exclude_ids`. `depth` is the
+        number of rows ranked before `after`, which the HNSW candidate list
+        has to cover. Without iterative index scans (pgvector < 0.8) the scan
+        stops after ef_search candidates, so a filtered page that comes back
+        short is ranked again exactly.
+        """
+        cosine_distance = self.model.embedding.cosine_distance(query_embedding)
+        distance = cosine_distance.label('relevance_score')
+        keyset = []
+        if after is not None:
+            keyset.append(cosine_distance >= after)
+        if exclude_ids:
+            keyset.append(Document.id.notin_(exclude_ids))
+        page_end = depth + len(exclude_ids or []) + limit
+        exact = page_end > HNSW_MAX_EF_SEARCH and not self._iterative_scan_supported(db)
+        rows = self._nearest_query(
+            db, self.model.id, distance, filters=filters, ef_search=ef_search, page_end=page_end,
+            extra_conditions=keyset, exact=exact
+        ).limit(limit).all()
+        filtered = bool(keyset) or (filters is not None and not filters.is_empty())
+        if len(rows) < limit and filtered and not exact and not self._iterative_scan_supported(db):
+            exact = True
+            rows = self._nearest_query(
+                db, self.model.id, distance, filters=filters, ef_search=ef_search, page_end=page_end,
+                extra_conditions=keyset, exact=True
+            ).limit(limit).all()
+        if exact:
+            db.execute(text("SELECT set_config('enable_indexscan', 'on', true)"))
+        return [tuple(row) for row in rows]
+
+    def _iterative_scan_supported(self, db: Session) -> bool:
+        """Whether hnsw.iterative_scan is configured and the installed pgvector (>= 0.8) has it."""
+        if not settings.VECTOR_INDEX_ITERATIVE_SCAN:
+            return False
+        if CRUDDocument._pgvector_version is None:
+            version = db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar()
+            CRUDDocument._pgvector_version = tuple(int(part) for part in re.findall(r"\d+", version or "")[:3])
+            logger.info(f"Found pgvector {version}")
+        return CRUDDocument._pgvector_version >= (0, 8)
+
+    def _nearest_query(self, db: Session, entity, distance, *, filters, ef_search, page_end: int, extra_conditions=(), exact: bool = False):
+        conditions = self._filter_conditions(db, filters) + list(extra_conditions)
+        iterative = bool(conditions) and self._iterative_scan_supported(db)
+
+        # The HNSW scan returns at most ef_search rows, so never go below the page end
+        ef_search = max(ef_search or settings.VECTOR_INDEX_EF_SEARCH, page_end)
+        if conditions and not iterative:
+            # Rows the filters reject still take up places in the candidate list
+            ef_search = min(max(ef_search, settings.VECTOR_INDEX_FILTERED_EF_SEARCH), HNSW_MAX_EF_SEARCH)
+        if exact:
+            # Without the HNSW order Postgres ranks every matching row exactly;
+            # callers turn index scans back on afterwards
+            db.execute(text("SELECT set_config('enable_indexscan', 'off', true)"))
+        else:
+            db.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                {"ef_search": str(min(ef_search, HNSW_MAX_EF_SEARCH))}
+            )
+        if iterative:
+            # Keep walking the index until enough rows pass the filters
+            db.execute(
+                text("SELECT set_config('hnsw.iterative_scan', :mode, true)"),
+                {"mode": settings.VECTOR_INDEX_ITERATIVE_SCAN}
             )
-            .join(Document.tags)
-            .order_by(
-                func.cosine_distance(self.model.embedding, text(f"'{query_embedding}'::vector"))
+        # The vector is bound through the pgvector column type and ordered by its
+        # label, so the distance is computed once and the HNSW index can serve
+        # the ORDER BY. That needs the distance to be the only sort key (before
+        # PostgreSQL 17), so ties are left to the callers.
+        return (
+            db.query(entity, distance)
+            .filter(self.model.embedding.isnot(None), *conditions)
+            .order_by(distance)
+        )
+
+    def get_ids_by_full_text(
+        self,
+        db: Session,
+        *,
+        query: str,
+        limit: int = 10,
+        filters: Optional[SearchFilters] = None,
+        timeout_ms: Optional[int] = None
+    ) -> List[int]:
+        """Ids of documents matching the query in title or summary, best ts_rank_cd first.
+
+        With `timeout_ms` Postgres cancels the query once it runs that long.
+        """
+        if timeout_ms:
+            db.execute(
+                text("SELECT set_config('statement_timeout', :timeout, true)"),
+                {"timeout": str(int(timeout_ms))}
             )
-            .offset(skip)
+        ts_query = func.websearch_to_tsquery('english', query)
+        rank = func.ts_rank_cd(Document.search_vector, ts_query).label('rank')
+        rows = (
+            db.query(Document.id, rank)
+            .filter(Document.search_vector.op('@@')(ts_query), *self._filter_conditions(db, filters))
+            .order_by(rank.desc(), Document.id)
             .limit(limit)
+            .all()
         )
+        return [document_id for document_id, _ in rows]
 
-        results = query.all()
-        return results
+    def get_distances(self, db: Session, *, ids: List[int], query_embedding) -> Dict[int, float]:
+        """Cosine distance from the embedding for each of the given documents."""
+        if not ids:
+            return {}
+        rows = (
+            db.query(Document.id, Document.embedding.cosine_distance(query_embedding))
+            .filter(Document.id.in_(ids), Document.embedding.isnot(None))
+            .all()
+        )
+        return {document_id: distance for document_id, distance in rows}
 
 document = CRUDDocument(Document)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from app.db.base_class import Base
 from app.models.user import User
 from app.models.document import Document
-from app.models.tag import Tag
\ No newline at end of file
+from app.models.tag import Tag
+from app.models.query_embedding import QueryEmbedding
\ No newline at end of file
@@ -37,4 +37,14 @@ async def get_current_user(
     user = crud_user.get(db, id=user_id)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_active_superuser(
+    current_user = Depends(get_current_user)
+):
+    if not current_user.is_active or not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges"
+        )
+    return current_user
\ No newline at end of file
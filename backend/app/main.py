@@ -5,9 +5,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .api.v1.api import api_router
 import logging
+import os
 from sqlalchemy.orm import Session
 from .db.session import SessionLocal
 from .initialize_db import initialize_tags, initialize_user
+from .services.embedding_engine import embedding_engine
+from .services.search_service import search_service
+from .services.vector_index import document_vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +24,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
-app.mount("/", StaticFiles(directory="/app/static", html=True), name="static")
+# The frontend build only exists in the production image
+if os.path.isdir("/app/static"):
+    app.mount("/", StaticFiles(directory="/app/static", html=True), name="static")
 
 @app.get("/health")
 def read_root():
@@ -34,14 +41,23 @@ def read_root():
 
 @app.on_event("startup")
 def on_startup():
+    embedding_engine.warmup()
     db: Session = SessionLocal()
     try:
         initialize_tags(db)
         logger.info("Tags initialized")
         initialize_user(db)
         logger.info("Admin user initialized")
+        search_service.query_cache.load(db)
+        if settings.SEARCH_BACKEND == "memory":
+            document_vector_index.ensure_fresh(db, force=True)
     finally:
         db.close()
 
+@app.on_event("shutdown")
+def on_shutdown():
+    search_service.query_cache.flush()
+    embedding_engine.shutdown()
+
 
 logger.info("Clean cooking library Api deployed")
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .document import Document
 from .tag import Tag
-from .user import User
\ No newline at end of file
+from .user import User
+from .query_embedding import QueryEmbedding
\ No newline at end of file
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ARRAY, Float, ForeignKey, Table, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ARRAY, Float, ForeignKey, Table, Enum, Index, Computed
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from pgvector.sqlalchemy import Vector
 from datetime import datetime
 from app.db.base_class import Base
@@ -32,8 +34,10 @@ class ResourceType(enum.Enum):
 document_tags = Table(
     'document_tags',
     Base.metadata,
-    Column('document_id', Integer, ForeignKey('document.id')),
-    Column('tag_id', Integer, ForeignKey('tag.id'))
+    Column('document_id', Integer, ForeignKey('document.id'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tag.id'), primary_key=True),
+    # The primary key serves document -> tags lookups, this one tag -> documents
+    Index('ix_document_tags_tag_id_document_id', 'tag_id', 'document_id')
 )
 
 class Document(Base):
@@ -42,17 +46,43 @@ class Document(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String, index=True)
     summary = Column(Text, nullable=True)
-    content = Column(Text, nullable=True)
+    # Never part of the Document response, so only loaded when accessed
+    content = deferred(Column(Text, nullable=True))
     source_url = Column(String, unique=True)
     year_published = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    embedding = Column(Vector, nullable=True)  # Added this line
+    embedding = deferred(Column(Vector(384), nullable=True))
     resource_type = Column(Enum(ResourceType), nullable=True)
+    # Copy of the document_tags links, kept in sync by CRUDDocument for @> / && filters
+    tag_ids = Column(postgresql.ARRAY(Integer), nullable=False, default=list, server_default='{}')
+    # Maintained by Postgres from title and summary, only used in WHERE/ORDER BY
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'B')",
+            persisted=True
+        )
+    ))
     
     # Relationships
     tags = relationship("Tag", secondary=document_tags, back_populates="documents")
 
+    __table_args__ = (
+        Index(
+            'ix_document_embedding_hnsw',
+            'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'}
+        ),
+        Index('ix_document_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_document_tag_ids', 'tag_ids', postgresql_using='gin'),
+        Index('ix_document_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('ix_document_summary_trgm', 'summary', postgresql_using='gin', postgresql_ops={'summary': 'gin_trgm_ops'}),
+    )
+
 
 class WhitelistedDomain(Base):
     __tablename__ = "whitelisted_domain"
@@ -0,0 +1,14 @@
+# backend/app/models/query_embedding.py
+from sqlalchemy import Column, String, DateTime
+from pgvector.sqlalchemy import Vector
+from datetime import datetime
+from app.db.base_class import Base
+
+class QueryEmbedding(Base):
+    """Persisted entry of the search query-embedding cache."""
+    __tablename__ = "query_embedding"
+
+    query = Column(String, primary_key=True)  # normalized query text
+    model = Column(String, primary_key=True)  # embedding model that produced the vector
+    embedding = Column(Vector(384), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -5,6 +5,8 @@ from .token import Token, TokenPayload
 from .search import SearchQuery, SearchResult
 from .search import (
     SearchQuery,
+    SearchFilters,
+    TagMatch,
     SearchResult,
     ExternalSearchResult,
     CombinedSearchResponse,
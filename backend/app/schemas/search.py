@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 #from .tag import Tag
 from enum import Enum
+from app.models.document import ResourceType
 
 class TagCategory(str, Enum):
     REGION = "region"
@@ -13,17 +14,54 @@ class TagCategory(str, Enum):
     CUSTOMER_JOURNEY = "customer_journey"
     UNKNOWN = "unknown"
 
+class TagMatch(str, Enum):
+    ALL = "all"
+    ANY = "any"
+
 class Tag(BaseModel):
     id: Optional[int] = None
     name: str
     category: TagCategory 
 
+class SearchFilters(BaseModel):
+    """Constraints applied inside the vector search, not after it."""
+    region: Optional[str] = None
+    topic: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)  # tag names, combined according to tag_match
+    tag_match: TagMatch = TagMatch.ALL  # all: documents carry every tag (@>), any: at least one (&&)
+    category: Optional[TagCategory] = None  # documents must carry a tag of this category
+    year: Optional[int] = None
+    resource_type: Optional[ResourceType] = None
+
+    def is_empty(self) -> bool:
+        return not any([self.region, self.topic, self.tags, self.category, self.year, self.resource_type])
+
 class SearchQuery(BaseModel):
     query: str = Field(..., min_length=1)
     limit: Optional[int] = Field(default=10, ge=1, le=50)
     include_external: Optional[bool] = Field(default=True)
     region: Optional[str] = None
     topic: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    tag_match: TagMatch = TagMatch.ALL
+    category: Optional[TagCategory] = None
+    year: Optional[int] = None
+    resource_type: Optional[ResourceType] = None
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000)
+    latency_budget_ms: Optional[int] = Field(default=None, ge=50, le=30000)
+    cursor: Optional[str] = None  # next_cursor of a previous response; its query and filters take precedence
+
+    @property
+    def filters(self) -> SearchFilters:
+        return SearchFilters(
+            region=self.region,
+            topic=self.topic,
+            tags=self.tags,
+            tag_match=self.tag_match,
+            category=self.category,
+            year=self.year,
+            resource_type=self.resource_type
+        )
 
 class TagInResponse(BaseModel):
     name: str
@@ -49,6 +87,8 @@ class ExternalSearchResult(BaseSearchResult):
 class CombinedSearchResponse(BaseModel):
     internal_results: List[SearchResult] = Field(default_factory=list)
     external_results: List[ExternalSearchResult] = Field(default_factory=list)
+    next_cursor: Optional[str] = None  # pass back as SearchQuery.cursor for the next page of internal results
+    skipped_retrievers: List[str] = Field(default_factory=list)  # "vector"/"lexical" left out of internal_results (over budget or failed)
 
 # class SearchResult(BaseModel):
 #     document_id: int
@@ -0,0 +1,300 @@
+# backend/app/services/bulk_import.py
+
+import argparse
+import csv
+import fcntl
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_document
+from app.db.session import SessionLocal
+from app.models.document import ResourceType
+from app.schemas.document import DocumentCreate
+from app.schemas.tag import Tag
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "tsv", "jsonl")
+DELIMITERS = {"csv": ",", "tsv": "\t"}
+TAG_SEPARATORS = re.compile(r"[;|]")
+
+def detect_format(filename: str) -> str:
+    """Guess "csv", "tsv" or "jsonl" from a file name."""
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if extension == "tsv":
+        return "tsv"
+    if extension in ("csv", "txt"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {filename}, pass one of: {', '.join(FORMATS)}")
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Union[Dict, str]]:
+    """Yield one record per CSV/TSV row or JSONL line without reading the whole file.
+
+    Rows come as dicts. JSONL lines come unparsed and are parsed by
+    `to_document`, so a malformed line is skipped like any invalid record.
+    """
+    if fmt in DELIMITERS:
+        yield from csv.DictReader(stream, delimiter=DELIMITERS[fmt])
+    elif fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield line
+    else:
+        raise ValueError(f"Unknown import format {fmt}, expected one of: {', '.join(FORMATS)}")
+
+def to_document(record: Union[Dict, str]) -> DocumentCreate:
+    """Build a DocumentCreate from an import record or JSONL line.
+
+    Tags may be a list of names or {"name", "category"} objects (JSONL), or
+    a string of names separated by ";" or "|" (CSV). Tags without a
+    category get one guessed from their name.
+    """
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError(f"Expected an object, got {type(record).__name__}")
+    tags = record.get("tags") or []
+    if isinstance(tags, str):
+        tags = [name.strip() for name in TAG_SEPARATORS.split(tags) if name.strip()]
+    year = record.get("year_published") or record.get("year")
+    try:
+        resource_type = ResourceType(record.get("resource_type"))
+    except ValueError:
+        resource_type = None
+    return DocumentCreate(
+        title=(record.get("title") or "").strip(),
+        summary=record.get("summary") or None,
+        source_url=(record.get("source_url") or record.get("url") or "").strip(),
+        year_published=int(year) if year not in (None, "") else None,
+        resource_type=resource_type,
+        tags=[
+            Tag(name=tag, category=None) if isinstance(tag, str) else Tag(**{"category": None, **tag})
+            for tag in tags
+        ],
+    )
+
+class BulkImporter:
+    """Stream records into the document table in fixed-size chunks.
+
+    Each chunk is embedded in one batch and written with one multi-row upsert
+    on source_url, then committed. After every commit the number of records
+    consumed is written to a checkpoint file, so a rerun after a crash skips
+    straight to the first uncommitted chunk.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = settings.IMPORT_CHUNK_SIZE,
+        checkpoint_path: Optional[str] = None
+    ):
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+
+    def run(self, db: Session, records: Iterable[Dict], source: str) -> Dict[str, int]:
+        """Import `records`, identified by `source` for resuming; returns counts."""
+        checkpoint = self._read_checkpoint(source)
+        stats = {"imported": checkpoint.get("imported", 0), "skipped": checkpoint.get("skipped", 0)}
+        consumed = checkpoint.get("consumed", 0)
+        if consumed:
+            logger.info(f"Resuming import of {source} after {consumed} records")
+
+        records = iter(records)
+        for _ in islice(records, consumed):
+            pass
+
+        started = time.perf_counter()
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            documents_in = []
+            for record in chunk:
+                try:
+                    document_in = to_document(record)
+                except (ValidationError, ValueError, TypeError) as e:
+                    logger.warning(f"Skipping invalid record: {str(e)}")
+                    stats["skipped"] += 1
+                    continue
+                if not document_in.title or not document_in.source_url:
+                    stats["skipped"] += 1
+                    continue
+                documents_in.append(document_in)
+
+            try:
+                stats["imported"] += crud_document.bulk_upsert(db, documents_in=documents_in)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            consumed += len(chunk)
+            self._write_checkpoint(source, consumed, stats)
+            elapsed = time.perf_counter() - started
+            logger.info(f"Imported {stats['imported']} documents from {source} ({consumed} records, {elapsed:.1f}s)")
+
+        self._clear_checkpoint()
+        return {**stats, "records": consumed}
+
+    def _read_checkpoint(self, source: str) -> Dict:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("source") != source:
+            logger.info(f"Ignoring checkpoint for {checkpoint.get('source')}, importing {source}")
+            return {}
+        return checkpoint
+
+    def _write_checkpoint(self, source: str, consumed: int, stats: Dict[str, int]) -> None:
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        with open(f"{self.checkpoint_path}.tmp", "w") as f:
+            json.dump({"source": source, "consumed": consumed, **stats}, f)
+        os.replace(f"{self.checkpoint_path}.tmp", self.checkpoint_path)
+
+    def _clear_checkpoint(self) -> None:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+def checkpoint_path_for(name: str, suffix: str = ".json") -> str:
+    """Checkpoint file in IMPORT_CHECKPOINT_DIR for an import source name.
+
+    Other files of the same import (status, lock) differ in `suffix`.
+    """
+    safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(name)) or "import"
+    return os.path.join(settings.IMPORT_CHECKPOINT_DIR, f"{safe_name}{suffix}")
+
+def import_stream(
+    db: Session,
+    stream: IO[bytes],
+    *,
+    name: str,
+    size: Optional[int] = None,
+    fmt: Optional[str] = None,
+    chunk_size: int = settings.IMPORT_CHUNK_SIZE
+) -> Dict[str, int]:
+    """Import a binary CSV/JSONL stream, resuming a checkpointed import of the same file.
+
+    The file is identified by its name and size, so a different file
+    uploaded under the same name starts from the beginning.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    importer = BulkImporter(chunk_size=chunk_size, checkpoint_path=checkpoint_path_for(name))
+    return importer.run(db, iter_records(text, fmt or detect_format(name)), f"{name}:{size}")
+
+def spool_upload(stream: IO[bytes], *, name: str) -> str:
+    """Copy an upload to a file in IMPORT_CHECKPOINT_DIR for a background import."""
+    os.makedirs(settings.IMPORT_CHECKPOINT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(
+        prefix=os.path.basename(checkpoint_path_for(name, ".")), suffix=".upload", dir=settings.IMPORT_CHECKPOINT_DIR
+    )
+    with os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(stream, f)
+    return path
+
+def import_running(name: str) -> bool:
+    """Whether an import of `name` is running in any worker."""
+    lock_path = checkpoint_path_for(name, ".lock")
+    if not os.path.exists(lock_path):
+        return False
+    with open(lock_path, "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+    return False
+
+def import_status(name: str) -> Optional[Dict]:
+    """Status of the latest import of `name`, with the checkpointed progress of a running one.
+
+    An import whose worker died before finishing is reported as
+    "interrupted"; uploading the file again resumes it.
+    """
+    status_path = checkpoint_path_for(name, ".status.json")
+    if not os.path.exists(status_path):
+        return None
+    with open(status_path) as f:
+        status = json.load(f)
+    if status["status"] == "running":
+        if not import_running(name):
+            status["status"] = "interrupted"
+        checkpoint = BulkImporter(checkpoint_path=checkpoint_path_for(name))._read_checkpoint(status["source"])
+        status.update({key: checkpoint[key] for key in ("consumed", "imported", "skipped") if key in checkpoint})
+    return status
+
+def _write_status(name: str, status: Dict) -> None:
+    status_path = checkpoint_path_for(name, ".status.json")
+    with open(f"{status_path}.tmp", "w") as f:
+        json.dump(status, f)
+    os.replace(f"{status_path}.tmp", status_path)
+
+def run_import(
+    path: str,
+    *,
+    name: str,
+    size: Optional[int] = None,
+    fmt: Optional[str] = None,
+    chunk_size: int = settings.IMPORT_CHUNK_SIZE
+) -> None:
+    """Import a spooled upload on a session of its own, recording its status.
+
+    Meant to run after the response has been sent. The lock held for the
+    whole import keeps a second upload of the same file from running
+    alongside; the spooled file is removed either way.
+    """
+    os.makedirs(settings.IMPORT_CHECKPOINT_DIR, exist_ok=True)
+    try:
+        with open(checkpoint_path_for(name, ".lock"), "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.warning(f"An import of {name} is already running, dropping this upload")
+                return
+            source = f"{name}:{size}"
+            _write_status(name, {"status": "running", "source": source})
+            db = SessionLocal()
+            try:
+                with open(path, "rb") as f:
+                    result = import_stream(db, f, name=name, size=size, fmt=fmt, chunk_size=chunk_size)
+                _write_status(name, {"status": "done", "source": source, **result})
+            except Exception as e:
+                logger.error(f"Import of {name} failed: {str(e)}")
+                _write_status(name, {"status": "failed", "source": source, "error": str(e)})
+            finally:
+                db.close()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import documents from a CSV, TSV or JSONL file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as f:
+            result = import_stream(
+                db, f, name=os.path.basename(args.path), size=os.path.getsize(args.path),
+                fmt=args.format, chunk_size=args.chunk_size
+            )
+        print(json.dumps(result))
+    finally:
+        db.close()
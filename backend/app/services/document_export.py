@@ -0,0 +1,145 @@
+# backend/app/services/document_export.py
+
+import base64
+import csv
+import io
+import json
+import logging
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from app.crud import crud_document
+from app.db.session import SessionLocal
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_BATCH_SIZE = 2000
+FIELDS = ["id", "title", "summary", "source_url", "year_published", "resource_type", "created_at", "updated_at", "tags"]
+
+def check_export_format(fmt: str) -> None:
+    """Raise ValueError if `fmt` cannot be exported in this environment."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt}, expected one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export needs pyarrow, which is not installed")
+
+def encode_embedding(embedding) -> bytes:
+    """Little-endian float32 bytes of an embedding, 4 bytes per dimension."""
+    return np.asarray(embedding, dtype="<f4").tobytes()
+
+def export_documents(fmt: str, include_embeddings: bool = False) -> Iterator[bytes]:
+    """Yield the whole library as `fmt`, one chunk per batch of rows.
+
+    Rows come from a server-side cursor on a session of its own, so memory
+    use does not depend on the library size and the session outlives the
+    request handler. Embeddings, if included, are float32 bytes: base64 in
+    NDJSON and CSV, a binary column in Parquet.
+    """
+    writers = {"ndjson": _ndjson_chunks, "csv": _csv_chunks, "parquet": _parquet_chunks}
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            crud_document.export_query(include_embeddings=include_embeddings)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        ).mappings()
+        for chunk in writers[fmt]((_plain_rows(batch, include_embeddings) for batch in result.partitions()), include_embeddings):
+            yield chunk
+        logger.info(f"Exported library as {fmt}")
+    finally:
+        db.close()
+
+def _plain_rows(batch, include_embeddings: bool) -> List[Dict]:
+    rows = []
+    for row in batch:
+        row = dict(row)
+        row["resource_type"] = row["resource_type"].value if row["resource_type"] else None
+        if include_embeddings:
+            row["embedding"] = encode_embedding(row["embedding"]) if row["embedding"] is not None else None
+        rows.append(row)
+    return rows
+
+def _ndjson_chunks(batches, include_embeddings: bool) -> Iterator[bytes]:
+    for rows in batches:
+        lines = []
+        for row in rows:
+            row["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+            row["updated_at"] = row["updated_at"].isoformat() if row["updated_at"] else None
+            if include_embeddings and row["embedding"] is not None:
+                row["embedding"] = base64.b64encode(row["embedding"]).decode()
+            lines.append(json.dumps(row))
+        yield ("\n".join(lines) + "\n").encode()
+
+def _csv_chunks(batches, include_embeddings: bool) -> Iterator[bytes]:
+    fields = FIELDS + (["embedding"] if include_embeddings else [])
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for rows in batches:
+        for row in rows:
+            # Same separator the bulk import reads
+            row["tags"] = ";".join(row["tags"])
+            if include_embeddings and row["embedding"] is not None:
+                row["embedding"] = base64.b64encode(row["embedding"]).decode()
+            writer.writerow(row)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects bytes until they are drained."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+def _parquet_chunks(batches, include_embeddings: bool) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = [
+        pa.field("id", pa.int64()),
+        pa.field("title", pa.string()),
+        pa.field("summary", pa.string()),
+        pa.field("source_url", pa.string()),
+        pa.field("year_published", pa.int32()),
+        pa.field("resource_type", pa.string()),
+        pa.field("created_at", pa.timestamp("us")),
+        pa.field("updated_at", pa.timestamp("us")),
+        pa.field("tags", pa.list_(pa.string())),
+    ]
+    if include_embeddings:
+        fields.append(pa.field("embedding", pa.binary()))
+    schema = pa.schema(fields)
+
+    sink = _ChunkSink()
+    # One row group per batch, flushed to the client as soon as it is written
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in batches:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
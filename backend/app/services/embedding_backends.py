@@ -0,0 +1,155 @@
+# backend/app/services/embedding_backends.py
+
+import logging
+import os
+import threading
+import argparse
+from typing import List
+
+import numpy as np
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"
+MAX_SEQ_LENGTH = 512
+
+class TorchEmbeddingBackend:
+    """sentence-transformers model running on torch."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if settings.TORCH_NUM_THREADS:
+            torch.set_num_threads(settings.TORCH_NUM_THREADS)
+        self.model = SentenceTransformer(model_name)
+        # Fast tokenizers are not safe to call from several threads at once,
+        # the forward pass is.
+        self._tokenize_lock = threading.Lock()
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        import torch
+        from sentence_transformers.util import batch_to_device
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            with self._tokenize_lock:
+                features = self.model.tokenize(texts[start:start + batch_size])
+            features = batch_to_device(features, self.model.device)
+            with torch.inference_mode():
+                output = self.model(features)
+            batches.append(output["sentence_embedding"].float().cpu().numpy())
+        return np.vstack(batches)
+
+class OnnxEmbeddingBackend:
+    """ONNX Runtime export of the model, optionally int8-quantized.
+
+    Reproduces the sentence-transformers pipeline of gte-small (BERT
+    encoder followed by attention-masked mean pooling) without torch.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.name = "onnx-int8" if quantized else "onnx"
+        model_file = ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found, export it with "
+                f"`python -m app.services.embedding_backends --output {model_dir}`"
+            )
+
+        options = ort.SessionOptions()
+        if settings.TORCH_NUM_THREADS:
+            options.intra_op_num_threads = settings.TORCH_NUM_THREADS
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": attention_mask,
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            feeds = {key: value for key, value in feeds.items() if key in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            mask = attention_mask[..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+        return np.vstack(batches)
+
+def load_embedding_backend(
+    backend: str = settings.EMBEDDING_BACKEND,
+    model_name: str = settings.EMBEDDING_MODEL_NAME
+):
+    """Build the embedding backend selected by EMBEDDING_BACKEND."""
+    logger.info(f"Loading {backend} embedding backend for {model_name}")
+    if backend == "torch":
+        return TorchEmbeddingBackend(model_name)
+    if backend == "onnx":
+        return OnnxEmbeddingBackend(settings.EMBEDDING_ONNX_DIR)
+    if backend == "onnx-int8":
+        return OnnxEmbeddingBackend(settings.EMBEDDING_ONNX_DIR, quantized=True)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+def export_onnx_model(
+    model_name: str = settings.EMBEDDING_MODEL_NAME,
+    output_dir: str = settings.EMBEDDING_ONNX_DIR
+) -> None:
+    """Export the encoder to ONNX, plus a dynamically int8-quantized copy.
+
+    Needs torch, sentence-transformers and onnxruntime; only the export
+    machine needs torch, serving the result does not.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(output_dir, exist_ok=True)
+    model = SentenceTransformer(model_name, device="cpu")
+    encoder = model[0].auto_model.eval()
+    encoder.config.return_dict = False
+    features = model.tokenize(["clean cooking export sample"])
+    inputs = ("input_ids", "attention_mask", "token_type_ids")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in inputs}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    model_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            encoder,
+            tuple(features[name] for name in inputs),
+            model_path,
+            input_names=list(inputs),
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    model.tokenizer.save_pretrained(output_dir)
+    quantize_dynamic(model_path, os.path.join(output_dir, ONNX_INT8_MODEL_FILE), weight_type=QuantType.QInt8)
+    logger.info(f"Exported {model_name} to {output_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_DIR)
+    args = parser.parse_args()
+    export_onnx_model(args.model, args.output)
@@ -0,0 +1,79 @@
+# backend/app/services/embedding_batcher.py
+
+import logging
+import asyncio
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from .embedding_engine import EmbeddingEngine, embedding_engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class EmbeddingBatcher:
+    """Coalesce concurrent single-text embedding requests into batched encodes.
+
+    Callers await `encode(text)`. Pending texts are collected until either
+    `max_batch_size` texts are waiting or `max_wait_ms` has passed since the
+    first one arrived, then the whole batch goes through one `aencode_many`
+    call and each caller's future is resolved with its own row.
+    """
+
+    def __init__(
+        self,
+        engine: EmbeddingEngine,
+        max_batch_size: int = settings.EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms: float = settings.EMBEDDING_BATCH_MAX_WAIT_MS
+    ):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def encode(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch."""
+        self._ensure_collector()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_collector(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._collector is None or self._collector.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._collector = loop.create_task(self._collect())
+
+    async def _collect(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Keep collecting the next batch while this one is encoded
+            self._loop.create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await self.engine.aencode_many(texts)
+        except Exception as e:
+            logger.error(f"Batched embedding of {len(texts)} texts failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding.tolist())
+
+
+embedding_batcher = EmbeddingBatcher(embedding_engine)
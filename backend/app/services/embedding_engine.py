@@ -0,0 +1,138 @@
+# backend/app/services/embedding_engine.py
+
+import logging
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from .embedding_backends import load_embedding_backend
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class EmbeddingEngine:
+    """Process-wide holder for the sentence embedding model.
+
+    The model is loaded once, on first use or on an explicit warmup, and
+    shared by every caller in the process. Async callers are served from a
+    worker pool so that inference never runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        model_name: str = settings.EMBEDDING_MODEL_NAME,
+        backend: str = settings.EMBEDDING_BACKEND
+    ):
+        self.model_name = model_name
+        self.backend_name = backend
+        self._backend = None
+        self._load_lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._queue_slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._load_lock:
+                # Another thread may have loaded it while we were waiting
+                if self._backend is None:
+                    self._backend = load_embedding_backend(self.backend_name, self.model_name)
+        return self._backend
+
+    def warmup(self) -> None:
+        """Load the model and run one encode so the first request is not slow."""
+        self.encode_one("warmup")
+        logger.info(f"Embedding model {self.model_name} ready on the {self.backend_name} backend")
+
+    def encode_one(self, text: str) -> List[float]:
+        """Embed a single text and return it as a list of floats."""
+        return self.encode_many([text])[0].tolist()
+
+    def encode_many(
+        self,
+        texts: Sequence[str],
+        batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Embed several texts in batched forward passes.
+
+        Returns a float32 matrix with one row per input text.
+        """
+        if not texts:
+            return np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        embeddings = self.backend.encode(list(texts), batch_size or settings.EMBEDDING_BATCH_SIZE)
+        return embeddings.astype(np.float32, copy=False)
+
+    async def aencode_one(self, text: str) -> List[float]:
+        """Embed a single text on the worker pool."""
+        embeddings = await self.aencode_many([text])
+        return embeddings[0].tolist()
+
+    async def aencode_many(
+        self,
+        texts: Sequence[str],
+        batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Embed several texts on the worker pool without blocking the event loop.
+
+        At most EMBEDDING_QUEUE_SIZE calls are submitted to the pool at once;
+        further callers wait for a free slot.
+        """
+        if self._queue_slots is None:
+            self._queue_slots = asyncio.Semaphore(settings.EMBEDDING_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        async with self._queue_slots:
+            if settings.EMBEDDING_POOL_KIND == "process":
+                call = _encode_in_worker
+            else:
+                call = self.encode_many
+            return await loop.run_in_executor(
+                self._get_executor(), call, list(texts), batch_size
+            )
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so that forked server workers each get their own
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    pool_size = settings.EMBEDDING_POOL_SIZE
+                    if settings.EMBEDDING_POOL_KIND == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=pool_size,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_worker,
+                            initargs=(self.model_name, self.backend_name)
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=pool_size,
+                            thread_name_prefix="embedding"
+                        )
+                    logger.info(f"Started {settings.EMBEDDING_POOL_KIND} embedding pool with {pool_size} workers")
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Engine used inside each process of a process pool
+_worker_engine: Optional[EmbeddingEngine] = None
+
+def _init_worker(model_name: str, backend: str) -> None:
+    global _worker_engine
+    _worker_engine = EmbeddingEngine(model_name, backend)
+    _worker_engine.warmup()
+
+def _encode_in_worker(texts: List[str], batch_size: Optional[int]) -> np.ndarray:
+    return _worker_engine.encode_many(texts, batch_size=batch_size)
+
+
+embedding_engine = EmbeddingEngine()
@@ -0,0 +1,210 @@
+# backend/app/services/query_cache.py
+
+import fcntl
+import logging
+import os
+import time
+import threading
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from cachetools import TTLCache
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.query_embedding import QueryEmbedding
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different spellings share a cache entry."""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return " ".join(text.split())
+
+class QueryEmbeddingCache:
+    """LRU + TTL cache of query embeddings keyed on normalized query text.
+
+    Entries can optionally be persisted to a local `.npz` file or to the
+    `query_embedding` table so a warm cache survives restarts. New entries
+    are buffered and written out by `flush()`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.QUERY_CACHE_SIZE,
+        ttl: int = settings.QUERY_CACHE_TTL,
+        persist: Optional[str] = settings.QUERY_CACHE_PERSIST,
+        path: str = settings.QUERY_CACHE_PATH,
+        model_name: str = f"{settings.EMBEDDING_MODEL_NAME}:{settings.EMBEDDING_BACKEND}"
+    ):
+        self.ttl = ttl
+        self.persist = persist
+        self.path = path
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+        # Values are (embedding, created-at timestamp) pairs
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, timer=time.time)
+        self._pending: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[List[float]]:
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry[0].tolist()
+
+    def set(self, query: str, embedding: List[float]) -> None:
+        key = normalize_query(query)
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._cache[key] = (vector, time.time())
+            if self.persist:
+                self._pending[key] = vector
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def load(self, db: Optional[Session] = None) -> None:
+        """Warm the cache from the configured persistence backend."""
+        try:
+            if self.persist == "file":
+                self._load_file()
+            elif self.persist == "postgres" and db is not None:
+                self._load_postgres(db)
+            else:
+                return
+            logger.info(f"Loaded {len(self._cache)} cached query embeddings from {self.persist}")
+        except Exception as e:
+            logger.error(f"Error loading query embedding cache: {str(e)}")
+
+    def flush(self) -> None:
+        """Write buffered entries to the configured persistence backend.
+
+        Postgres writes use a session of their own, so a failed flush never
+        leaves a request's session needing a rollback.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            if self.persist == "file":
+                self._save_file()
+            elif self.persist == "postgres":
+                db = SessionLocal()
+                try:
+                    self._save_postgres(db, pending)
+                except Exception:
+                    db.rollback()
+                    raise
+                finally:
+                    db.close()
+        except Exception as e:
+            logger.error(f"Error persisting query embedding cache: {str(e)}")
+            with self._lock:
+                # Keep them for the next attempt
+                pending.update(self._pending)
+                self._pending = pending
+
+    def _remember(self, key: str, vector: np.ndarray, created: float) -> None:
+        # Entries keep a fresh TTL once loaded; already expired ones are skipped
+        if time.time() - created < self.ttl:
+            self._cache[key] = (vector, created)
+
+    def _read_file(self) -> List[tuple]:
+        """(key, embedding, created) triples in the file, if it was built with this model."""
+        if not os.path.exists(self.path):
+            return []
+        with np.load(self.path, allow_pickle=False) as data:
+            if str(data["model"]) != self.model_name:
+                logger.info(f"Ignoring query cache file built with {data['model']}")
+                return []
+            return [
+                (str(key), vector, float(created))
+                for key, vector, created in zip(data["keys"], data["embeddings"], data["created"])
+            ]
+
+    def _load_file(self) -> None:
+        entries = self._read_file()
+        with self._lock:
+            # Oldest first so the newest entries are the last to be evicted
+            for key, vector, created in sorted(entries, key=lambda entry: entry[2]):
+                self._remember(key, vector, created)
+
+    def _save_file(self) -> None:
+        """Merge this process's entries into the file.
+
+        Every server worker flushes to the same path, so the file is read,
+        merged and replaced under an exclusive lock; entries other workers
+        wrote are kept, and the newer of two entries for a query wins.
+        """
+        with self._lock:
+            entries = dict(self._cache.items())
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            for key, vector, created in self._read_file():
+                if key not in entries or entries[key][1] < created:
+                    entries[key] = (vector, created)
+            now = time.time()
+            # The newest entries that load() would keep
+            newest = sorted(
+                ((key, entry) for key, entry in entries.items() if now - entry[1] < self.ttl),
+                key=lambda item: item[1][1], reverse=True
+            )[:self._cache.maxsize]
+            keys = [key for key, _ in newest]
+            if newest:
+                embeddings = np.stack([vector for _, (vector, _) in newest])
+            else:
+                embeddings = np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+            created = np.array([created for _, (_, created) in newest], dtype=np.float64)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp_path, keys=np.array(keys, dtype=str), embeddings=embeddings, created=created, model=self.model_name)
+            os.replace(tmp_path, self.path)
+
+    def _load_postgres(self, db: Session) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        rows = (
+            db.query(QueryEmbedding)
+            .filter(QueryEmbedding.model == self.model_name, QueryEmbedding.created_at >= cutoff)
+            .order_by(QueryEmbedding.created_at.desc())
+            .limit(self._cache.maxsize)
+            .all()
+        )
+        with self._lock:
+            # Oldest first so the newest entries are the last to be evicted
+            for row in reversed(rows):
+                self._remember(row.query, np.asarray(row.embedding, dtype=np.float32), row.created_at.replace(tzinfo=timezone.utc).timestamp())
+
+    def _save_postgres(self, db: Session, pending: Dict[str, np.ndarray]) -> None:
+        stmt = insert(QueryEmbedding).values([
+            {"query": key, "model": self.model_name, "embedding": vector.tolist(), "created_at": datetime.utcnow()}
+            for key, vector in pending.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[QueryEmbedding.query, QueryEmbedding.model],
+            set_={"embedding": stmt.excluded.embedding, "created_at": stmt.excluded.created_at}
+        )
+        db.execute(stmt)
+        db.commit()
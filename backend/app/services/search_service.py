@@ -4,30 +4,34 @@ import logging
 import json
 import asyncio
 import csv
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
 # from openai import OpenAI
-import aiohttp
-from cachetools import TTLCache
 import numpy as np
 import traceback
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import partial
 from ast import literal_eval
 
 from app.core.config import settings
-from app.models.tag import Tag as TagModel
+from app.core.cursor import encode_cursor, decode_cursor
 from app.models.document import Document, WhitelistedDomain
 from app.schemas.search import (
     SearchResult,
     ExternalSearchResult,
     CombinedSearchResponse,
+    SearchFilters,
     Tag,
     TagCategory
 )
 from app.schemas.document import DocumentCreate
 from ..crud import crud_document
+from ..db.session import SessionLocal
+from .embedding_engine import embedding_engine
+from .embedding_batcher import embedding_batcher
+from .query_cache import QueryEmbeddingCache, normalize_query
+from .vector_index import document_vector_index
+from .tag_matrix import tag_matrix
 
 
 logging.basicConfig(level=logging.INFO)
@@ -35,7 +39,8 @@ logger = logging.getLogger(__name__)
 
 class SearchService:
     def __init__(self, csv_file_path: Optional[str] = None):
-        self.cache = TTLCache(maxsize=100, ttl=3600)
+        self.query_cache = QueryEmbeddingCache()
+        self.tag_matrix = tag_matrix
         # self.whitelisted_domains = [
         #     'cleancookingalliance.org',
         #     'who.int',
@@ -56,22 +61,43 @@ class SearchService:
         db: Session,
         query: str,
         limit: int = 10,
-        include_external: bool = True
+        include_external: bool = True,
+        filters: Optional[SearchFilters] = None,
+        ef_search: Optional[int] = None,
+        latency_budget_ms: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> CombinedSearchResponse:
-        """Perform hybrid search across internal and external sources."""
+        """Perform hybrid search across internal and external sources.
+
+        With a `cursor` from a previous response the next page of internal
+        results is returned instead; the query and filters come from the
+        cursor and external sources are not searched again.
+        """
+        if cursor:
+            position = self._decode_search_cursor(cursor)
+            internal_results, next_cursor = await self._search_page(db, position, limit, ef_search=ef_search)
+            logger.info(f"Search continuation found {len(internal_results)} results")
+            return CombinedSearchResponse(internal_results=internal_results, next_cursor=next_cursor)
+
         try:
-            self.whitelisted_domains = [domain.domain for domain in db.query(WhitelistedDomain).all()]
+            self.whitelisted_domains = await asyncio.get_running_loop().run_in_executor(
+                None, self._whitelisted_domains, db
+            )
             # print(self.whitelisted_domains)
             
             logger.info(f"Starting search for query: {query}")
 
             # Internal search
             try:
-                internal_results = await self._search_internal(db, query, limit)
+                internal_results, next_cursor, skipped_retrievers = await self._search_internal(
+                    db, query, limit, filters=filters, ef_search=ef_search,
+                    latency_budget_ms=latency_budget_ms
+                )
                 logger.info(f"Internal search found {len(internal_results)} results")
             except Exception as e:
                 logger.error(f"Internal search error: {str(e)}")
-                internal_results = []
+                internal_results, next_cursor = [], None
+                skipped_retrievers = ["vector", "lexical"] if settings.HYBRID_SEARCH else ["vector"]
                 
             urls = [result.source_url for result in internal_results]
 
@@ -94,7 +120,9 @@ class SearchService:
             
             return CombinedSearchResponse(
                 internal_results=internal_results,
-                external_results=external_results
+                external_results=external_results,
+                next_cursor=next_cursor,
+                skipped_retrievers=skipped_retrievers
             )
 
         except Exception as e:
@@ -105,16 +133,179 @@ class SearchService:
         self,
         db: Session,
         query: str,
-        limit: int
-    ) -> List[SearchResult]:
-        """Search internal database using FAISS with tags included."""
+        limit: int,
+        filters: Optional[SearchFilters] = None,
+        ef_search: Optional[int] = None,
+        latency_budget_ms: Optional[int] = None
+    ) -> Tuple[List[SearchResult], Optional[str], List[str]]:
+        """Search internal documents, fusing vector and full-text rankings.
+
+        The full-text query runs on the request session and the vector query
+        on a session of its own, concurrently. The latency budget starts once
+        the query is embedded and bounds both: the vector ranking is skipped
+        if it is not back by then, and Postgres cancels a full-text query
+        running past it. Returns the fused results, a cursor for the next
+        page if the vector ranking may continue, and the retrievers that
+        were skipped or failed.
+        """
         try:
             logger.info("Starting internal search")
+            loop = asyncio.get_running_loop()
+            budget_ms = latency_budget_ms or settings.SEARCH_LATENCY_BUDGET_MS
+            candidates = max(limit, settings.HYBRID_CANDIDATES)
+
+            # Full-text search needs no embedding, so it starts first
+            retrievers = {}
+            if settings.HYBRID_SEARCH:
+                retrievers["lexical"] = loop.run_in_executor(
+                    None, self._lexical_search, db, query, candidates, filters, budget_ms
+                )
+            query_embedding = await self._get_query_embedding(db, query)
+            # A slow embedding (cold worker, full queue) must not cost the retrieval its budget
+            deadline = loop.time() + budget_ms / 1000
+            retrievers["vector"] = loop.run_in_executor(
+                None, self._vector_search, query_embedding, candidates, filters, ef_search
+            )
+
+            await asyncio.wait([retrievers["vector"]], timeout=max(deadline - loop.time(), 0))
+            if "lexical" in retrievers:
+                # Bounded by its statement timeout; the request session is not free before
+                await asyncio.wait([retrievers["lexical"]])
+            results, skipped = {}, []
+            for name, future in retrievers.items():
+                if not future.done():
+                    logger.warning(f"{name} search exceeded the latency budget, skipping it")
+                    future.add_done_callback(lambda f: f.exception())
+                    skipped.append(name)
+                elif future.exception():
+                    logger.error(f"{name} search error: {str(future.exception())}")
+                    skipped.append(name)
+                else:
+                    results[name] = future.result()
+
+            vector_hits = results.get("vector", [])
+            distances = dict(vector_hits)
+            rankings = [[document_id for document_id, _ in vector_hits], results.get("lexical", [])]
+            document_ids = reciprocal_rank_fusion(rankings, k=settings.HYBRID_RRF_K)[:limit]
+
+            # Documents found only by full-text search still get a cosine score
+            lexical_only = [document_id for document_id in document_ids if document_id not in distances]
+            if lexical_only:
+                distances.update(await loop.run_in_executor(
+                    None, partial(crud_document.get_distances, db, ids=lexical_only, query_embedding=query_embedding)
+                ))
+
+            scored_documents = await loop.run_in_executor(None, self._to_results, db, document_ids, distances)
+            next_cursor = None
+            if "vector" in results and len(scored_documents) == limit:
+                next_cursor = self._first_page_cursor(query, filters, vector_hits, document_ids, distances)
+            return scored_documents, next_cursor, skipped
+
+        except Exception as e:
+            logger.error(f"Internal search error: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise
+
+    async def _search_page(
+        self,
+        db: Session,
+        position: dict,
+        limit: int,
+        ef_search: Optional[int] = None
+    ) -> Tuple[List[SearchResult], Optional[str]]:
+        """Next page of a search, resuming the vector scan behind the cursor.
+
+        The query embedding comes from the cache under the key in the cursor;
+        it is only encoded again if it has been evicted meanwhile.
+        """
+        query_embedding = await self._get_query_embedding(db, position["query"])
+        filters = SearchFilters.model_validate(position["filters"])
+        after, depth = position["after"], position["depth"]
+        seen = dict(position["seen"])
+
+        loop = asyncio.get_running_loop()
+        hits = await loop.run_in_executor(
+            None, self._vector_search, query_embedding, limit, filters, ef_search, after, list(seen), depth
+        )
+        if hits:
+            last_distance = hits[-1][1]
+            # Rows closer than the new position are behind the scan now; those at it
+            # (equal distances come in no fixed order) stay excluded
+            depth += sum(1 for distance in seen.values() if distance < last_distance)
+            depth += sum(1 for _, distance in hits if distance < last_distance)
+            seen = {document_id: distance for document_id, distance in [*seen.items(), *hits] if distance >= last_distance}
+            after = last_distance
+
+        results = await loop.run_in_executor(
+            None, self._to_results, db, [document_id for document_id, _ in hits], dict(hits)
+        )
+        next_cursor = None
+        if len(hits) == limit:
+            next_cursor = encode_cursor({
+                **position, "after": after, "depth": depth, "seen": [list(item) for item in seen.items()]
+            })
+        return results, next_cursor
+
+    def _first_page_cursor(
+        self,
+        query: str,
+        filters: Optional[SearchFilters],
+        vector_hits: List[tuple],
+        document_ids: List[int],
+        distances: Dict[int, float]
+    ) -> str:
+        """Cursor continuing a fused first page with the vector ranking.
+
+        `after` is the distance at the end of the longest prefix of the vector
+        ranking shown on the page and `depth` the number of rows before it.
+        Shown documents at or beyond that distance are listed in `seen` so
+        later pages skip them.
+        """
+        shown = set(document_ids)
+        prefix = 0
+        while prefix < len(vector_hits) and vector_hits[prefix][0] in shown:
+            prefix += 1
+        after = vector_hits[prefix - 1][1] if prefix else None
+        depth = sum(1 for _, distance in vector_hits[:prefix] if distance < after) if prefix else 0
+        seen = [
+            [document_id, distances[document_id]] for document_id in document_ids
+            if distances.get(document_id) is not None and (after is None or distances[document_id] >= after)
+        ]
+        return encode_cursor({
+            "query": normalize_query(query),
+            "model": self.query_cache.model_name,
+            "filters": (filters or SearchFilters()).model_dump(mode="json"),
+            "after": after,
+            "depth": depth,
+            "seen": seen,
+        })
+
+    def _decode_search_cursor(self, cursor: str) -> dict:
+        """Validate a search cursor, raising ValueError if it cannot be resumed."""
+        position = decode_cursor(cursor)
+        if not {"query", "model", "filters", "after", "depth", "seen"} <= position.keys():
+            raise ValueError("Invalid cursor")
+        if position["model"] != self.query_cache.model_name:
+            raise ValueError("Cursor was issued for a different embedding model")
+        if not isinstance(position["query"], str):
+            raise ValueError("Invalid cursor")
+        try:
+            position["filters"] = SearchFilters.model_validate(position["filters"]).model_dump(mode="json")
+            position["seen"] = [(int(document_id), float(distance)) for document_id, distance in position["seen"]]
+            position["depth"] = max(int(position["depth"]), 0)
+            if position["after"] is not None:
+                position["after"] = float(position["after"])
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        return position
+
+    def _whitelisted_domains(self, db: Session) -> List[str]:
+        return [domain.domain for domain in db.query(WhitelistedDomain).all()]
 
-            query_embedding = self._get_embedding(query)
-            query_results =  crud_document.document.get_by_text_embedding(db, query_embedding=query_embedding, limit=limit)
-            scored_documents = []
-            for (document, relevance_score) in query_results:
+    def _to_results(self, db: Session, document_ids: List[int], distances: Dict[int, float]) -> List[SearchResult]:
+        """Load documents in ranking order and turn cosine distances into scores."""
+        scored_documents = []
+        for document in crud_document.get_by_ids(db, ids=document_ids):
                 tags = [
                     Tag(
                         id=tag.id,
@@ -122,22 +313,70 @@ class SearchService:
                         category=TagCategory(tag.category.value if tag.category else "unknown")
                     ) for tag in document.tags
                 ]
+                relevance_score = distances.get(document.id, 1.0)
                 scored_documents.append(SearchResult(
                     document_id=document.id,
                     title=document.title,
                     summary=document.summary or "",
                     source_url=document.source_url,
-                    relevance_score=float(f"{1-relevance_score:.2f}"),  # Convert distance to similarity
+                    relevance_score=float(f"{min(max(1 - relevance_score, 0.0), 1.0):.2f}"),  # Convert distance to similarity
                     tags=tags,
                     source="internal"
                 ))
+        return scored_documents
 
-            return scored_documents
+    def _vector_search(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[SearchFilters] = None,
+        ef_search: Optional[int] = None,
+        after: Optional[float] = None,
+        exclude_ids: Optional[List[int]] = None,
+        depth: int = 0
+    ) -> List[tuple]:
+        """(document id, cosine distance) pairs from the configured vector backend."""
+        db = SessionLocal()
+        try:
+            if settings.SEARCH_BACKEND == "memory":
+                document_vector_index.ensure_fresh(db)
+                allowed_ids = None
+                if filters and not filters.is_empty():
+                    allowed_ids = crud_document.get_ids(db, filters=filters)
+                return document_vector_index.search(
+                    query_embedding, limit=limit, allowed_ids=allowed_ids, after=after, exclude_ids=exclude_ids
+                )
+            return crud_document.get_ids_by_text_embedding(
+                db, query_embedding=query_embedding, limit=limit, filters=filters, ef_search=ef_search,
+                after=after, exclude_ids=exclude_ids, depth=depth
+            )
+        finally:
+            db.close()
 
-        except Exception as e:
-            logger.error(f"Internal search error: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise
+    def _lexical_search(
+        self,
+        db: Session,
+        query: str,
+        limit: int,
+        filters: Optional[SearchFilters] = None,
+        timeout_ms: Optional[int] = None
+    ) -> List[int]:
+        """Document ids ranked by Postgres full-text search."""
+        try:
+            return crud_document.get_ids_by_full_text(
+                db, query=query, limit=limit, filters=filters, timeout_ms=timeout_ms
+            )
+        finally:
+            # Drops the statement timeout and a transaction aborted by it
+            db.rollback()
+
+    def _autosave(self, document_in: DocumentCreate) -> Document:
+        """Save an external result as a document on a session of its own."""
+        db = SessionLocal()
+        try:
+            return crud_document.create(db=db, obj_in=document_in)
+        finally:
+            db.close()
 
     async def _search_external(
         self,
@@ -151,7 +390,10 @@ class SearchService:
             if not hasattr(settings, 'PERPLEXITY_API_KEY') or not settings.PERPLEXITY_API_KEY:
                 logger.warning("Perplexity API key not configured, skipping external search")
                 return []
-            
+
+            # Only needed for external search, and slow to import
+            import aiohttp
+
             async with aiohttp.ClientSession() as session:
                 headers = {
                     "Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}",
@@ -206,13 +448,13 @@ class SearchService:
                         results = json.loads(json_content)
                         processed_results = []
                         
-                        for result in results[:limit]:
+                        results = results[:limit]
+                        summary_vecs = await self.encode_many([result['summary'] for result in results])
+                        # One matrix multiply scores every summary against every tag
+                        matched_tags = self.tag_matrix.match(db, summary_vecs)
+
+                        for result, tags in zip(results, matched_tags):
                             autosaving = hasattr(settings, 'VITE_AUTOSAVE_DOCS') and settings.VITE_AUTOSAVE_DOCS and hasattr(settings, 'MIN_RELEVANCE') and self._calculate_relevance_score(result['url']) >= settings.MIN_RELEVANCE
-                            summary_vec = self._get_embedding(result['summary'])
-                            tags = []
-                            for tag in db.query(TagModel).all():
-                                if self._calculate_distance(summary_vec, tag.embedding) >= 0.8:
-                                    tags.append({"name": tag.name, "category": tag.category, "embedding": tag.embedding})
                                         
                             if autosaving and db.query(Document).filter_by(source_url=result['url']).first() is None:
                                 document_create = DocumentCreate(
@@ -224,7 +466,10 @@ class SearchService:
                                     tags=tags
                                 )   
                                 try:
-                                    document = crud_document.document.create(db=db, obj_in=document_create)
+                                    # create() embeds the document, so keep it off the event loop
+                                    document = await asyncio.get_running_loop().run_in_executor(
+                                        None, self._autosave, document_create
+                                    )
                                     logger.info(f"Added document {document.title} to internal database instead of showing in external search.")
                                     processed_results.append(ExternalSearchResult(
                                         title=result['title'],
@@ -291,18 +536,30 @@ class SearchService:
         # If none of the above, assign the default score
         return 0.5  # Base score for other domains not specifically categorized
 
+    async def _get_query_embedding(self, db: Session, query: str) -> List[float]:
+        """Return the query embedding from the cache, encoding it on a miss."""
+        query_embedding = self.query_cache.get(query)
+        if query_embedding is None:
+            query_embedding = await embedding_batcher.encode(query)
+            self.query_cache.set(query, query_embedding)
+            if self.query_cache.pending >= settings.QUERY_CACHE_FLUSH_EVERY:
+                await asyncio.get_running_loop().run_in_executor(None, self.query_cache.flush)
+        return query_embedding
+
     def _get_embedding(self, text: str) -> List[float]:
         try:
-            model = SentenceTransformer('thenlper/gte-small')
-            embedding =  model.encode(text)
-            embedding_list = [float(value) for value in embedding] 
-            return embedding_list
+            return embedding_engine.encode_one(text)
         except Exception as e:
             logger.error(f"Error getting embedding: {str(e)}")
             raise
 
-    def _calculate_distance(self, summary, tag):
-        return cosine_similarity([summary], [tag])[0][0]
+    async def encode_many(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Embed a batch of texts, returning a float32 matrix with one row per text."""
+        try:
+            return await embedding_engine.aencode_many(texts, batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Error getting embeddings: {str(e)}")
+            raise
 
     def _create_metadata_text(self, document: Document) -> str:
         """Create a text representation of document metadata for embedding."""
@@ -326,4 +583,13 @@ class SearchService:
             return content.strip()
 
 
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[int]:
+    """Merge ranked id lists by summing 1 / (k + rank) over the lists each id appears in."""
+    scores = {}
+    for ranking in rankings:
+        for rank, document_id in enumerate(ranking, start=1):
+            scores[document_id] = scores.get(document_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda document_id: (-scores[document_id], document_id))
+
+
 search_service = SearchService()
\ No newline at end of file
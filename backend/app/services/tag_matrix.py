@@ -0,0 +1,80 @@
+# backend/app/services/tag_matrix.py
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tag import Tag
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TagMatrix:
+    """L2-normalized embeddings of all tags, cached between requests.
+
+    The matrix is rebuilt when a Tag is inserted, updated or deleted through
+    the ORM in this process, when the row count or highest id of the tag
+    table changes (Core bulk inserts, other workers), or after TAG_MATRIX_TTL
+    seconds at the latest.
+    """
+
+    def __init__(self, ttl: float = settings.TAG_MATRIX_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tags: List[Dict] = []
+        self._matrix = np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        self._fingerprint: Optional[Tuple[int, Optional[int]]] = None
+        self._loaded_at = 0.0
+        self._stale = True
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def get(self, db: Session) -> Tuple[List[Dict], np.ndarray]:
+        """Tags (id, name, category) and their normalized embeddings, one row per tag."""
+        fingerprint = tuple(db.query(func.count(Tag.id), func.max(Tag.id)).one())
+        if self._stale or fingerprint != self._fingerprint or time.monotonic() - self._loaded_at > self.ttl:
+            with self._lock:
+                self._load(db, fingerprint)
+        return self._tags, self._matrix
+
+    def match(self, db: Session, embeddings: np.ndarray, threshold: float = settings.TAG_MATCH_THRESHOLD) -> List[List[Dict]]:
+        """For each embedding row, the tags with cosine similarity >= threshold."""
+        tags, matrix = self.get(db)
+        if not len(embeddings) or not len(tags):
+            return [[] for _ in range(len(embeddings))]
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        matches = (embeddings @ matrix.T) >= threshold
+        return [[tags[i] for i in np.flatnonzero(row)] for row in matches]
+
+    def _load(self, db: Session, fingerprint: Tuple[int, Optional[int]]) -> None:
+        self._stale = False
+        rows = db.query(Tag.id, Tag.name, Tag.category, Tag.embedding).filter(Tag.embedding.isnot(None)).order_by(Tag.id).all()
+        self._tags = [
+            {"id": tag_id, "name": name, "category": category.value if category else "unknown"}
+            for tag_id, name, category, _ in rows
+        ]
+        if rows:
+            matrix = np.vstack([np.asarray(embedding, dtype=np.float32) for *_, embedding in rows])
+            self._matrix = matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+        else:
+            self._matrix = np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        self._fingerprint = fingerprint
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded tag matrix of {len(rows)} tags")
+
+
+tag_matrix = TagMatrix()
+
+@event.listens_for(Tag, "after_insert")
+@event.listens_for(Tag, "after_update")
+@event.listens_for(Tag, "after_delete")
+def _invalidate_tag_matrix(mapper, connection, target) -> None:
+    tag_matrix.invalidate()
@@ -0,0 +1,228 @@
+# backend/app/services/vector_index.py
+
+import logging
+import os
+import json
+import time
+import fcntl
+import threading
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document import Document
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class _IndexState(NamedTuple):
+    base: np.ndarray
+    base_ids: np.ndarray
+    base_live: np.ndarray
+    delta: np.ndarray
+    delta_ids: np.ndarray
+
+
+def _empty_state() -> _IndexState:
+    return _IndexState(
+        base=np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32),
+        base_ids=np.empty(0, dtype=np.int64),
+        base_live=np.empty(0, dtype=bool),
+        delta=np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32),
+        delta_ids=np.empty(0, dtype=np.int64),
+    )
+
+class DocumentVectorIndex:
+    """Exact top-k search over a memory-mapped matrix of document embeddings.
+
+    The base matrix holds L2-normalized float32 rows and is written to disk
+    once, then opened with `mmap_mode="r"` so every worker process on the
+    host shares the same page-cache pages. Documents changed since the base
+    was written are pulled by `updated_at` into a small in-memory delta that
+    shadows their base rows; once the delta grows past
+    VECTOR_INDEX_MAX_DELTA the base file is rewritten.
+
+    The arrays are replaced together as one immutable state, so a search
+    running on another thread never mixes a new delta with old ids. Each
+    refresh re-reads the last VECTOR_INDEX_REFRESH_OVERLAP seconds of
+    updates, because `updated_at` is stamped before commit and a row may
+    become visible after a refresh has already moved past its timestamp.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.VECTOR_INDEX_PATH,
+        refresh_seconds: float = settings.VECTOR_INDEX_REFRESH_SECONDS,
+        max_delta: int = settings.VECTOR_INDEX_MAX_DELTA,
+        refresh_overlap: float = settings.VECTOR_INDEX_REFRESH_OVERLAP
+    ):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.max_delta = max_delta
+        self.refresh_overlap = timedelta(seconds=refresh_overlap)
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._loaded_mtime: Optional[float] = None
+        self._watermark: Optional[datetime] = None
+        self._state = _empty_state()
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def _lock_path(self) -> str:
+        return os.path.join(self.path, ".lock")
+
+    def __len__(self) -> int:
+        state = self._state
+        return int(state.base_live.sum()) + len(state.delta_ids)
+
+    def ensure_fresh(self, db: Session, force: bool = False) -> None:
+        """Load, reload or incrementally refresh the index if it is due."""
+        if not force and time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < self.refresh_seconds:
+                return
+            try:
+                mtime = self._meta_mtime()
+                if mtime is None:
+                    self._build(db)
+                elif mtime != self._loaded_mtime:
+                    self._load()
+                self._refresh(db)
+                if len(self._state.delta_ids) > self.max_delta:
+                    self._build(db)
+            finally:
+                self._last_refresh = time.monotonic()
+
+    def search(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        skip: int = 0,
+        allowed_ids: Optional[List[int]] = None,
+        after: Optional[float] = None,
+        exclude_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """Return (document id, cosine distance) pairs, nearest first.
+
+        If `allowed_ids` is given only those documents are ranked. `after`
+        is the distance of the last pair of the previous page; pairs closer
+        than that are skipped, and those shown at it are in `exclude_ids`.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        base, base_ids, base_live, delta, delta_ids = self._state
+        scores = np.concatenate([
+            np.where(base_live, base @ query, -np.inf) if len(base_ids) else np.empty(0, dtype=np.float32),
+            delta @ query if len(delta_ids) else np.empty(0, dtype=np.float32),
+        ])
+        ids = np.concatenate([base_ids, delta_ids])
+        if allowed_ids is not None:
+            scores[~np.isin(ids, np.asarray(allowed_ids, dtype=np.int64))] = -np.inf
+        if exclude_ids:
+            scores[np.isin(ids, np.asarray(exclude_ids, dtype=np.int64))] = -np.inf
+        if after is not None:
+            scores[1 - scores < after] = -np.inf
+
+        end = min(skip + limit, int(np.isfinite(scores).sum()))
+        if end <= skip:
+            return []
+        cutoff = scores[np.argpartition(-scores, end - 1)[end - 1]]
+        # Every row tied with the cutoff competes, so equal distances come in id order
+        top = np.flatnonzero(scores >= cutoff)
+        top = top[np.lexsort((ids[top], -scores[top]))][skip:end]
+        return [(int(ids[i]), float(1 - scores[i])) for i in top]
+
+    def _meta_mtime(self) -> Optional[float]:
+        return os.path.getmtime(self._meta_path) if os.path.exists(self._meta_path) else None
+
+    def _build(self, db: Session) -> None:
+        """Write a fresh base matrix from the document table and map it."""
+        os.makedirs(self.path, exist_ok=True)
+        seen_mtime = self._meta_mtime()
+        with open(self._lock_path, "w") as lock_file:
+            # Only one worker rebuilds, the others wait and then map its output
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self._meta_mtime() != seen_mtime:
+                    self._read()
+                    return
+                started = time.perf_counter()
+                ids, vectors, watermark = self._fetch(db, since=None)
+                np.save(os.path.join(self.path, "embeddings.tmp.npy"), vectors)
+                np.save(os.path.join(self.path, "ids.tmp.npy"), ids)
+                os.replace(os.path.join(self.path, "embeddings.tmp.npy"), os.path.join(self.path, "embeddings.npy"))
+                os.replace(os.path.join(self.path, "ids.tmp.npy"), os.path.join(self.path, "ids.npy"))
+                with open(f"{self._meta_path}.tmp", "w") as f:
+                    json.dump({
+                        "count": len(ids),
+                        "watermark": watermark.isoformat() if watermark else None,
+                    }, f)
+                os.replace(f"{self._meta_path}.tmp", self._meta_path)
+                logger.info(f"Built vector index of {len(ids)} documents in {time.perf_counter() - started:.2f}s")
+                self._read()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        """Map the files on disk, under a shared lock so no rebuild is half-written."""
+        with open(self._lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            try:
+                self._read()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> None:
+        # Callers hold the file lock
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        self._loaded_mtime = os.path.getmtime(self._meta_path)
+        base = np.load(os.path.join(self.path, "embeddings.npy"), mmap_mode="r")
+        base_ids = np.load(os.path.join(self.path, "ids.npy"))
+        self._state = _empty_state()._replace(base=base, base_ids=base_ids, base_live=np.ones(len(base_ids), dtype=bool))
+        self._watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        logger.info(f"Mapped vector index of {meta['count']} documents from {self.path}")
+
+    def _refresh(self, db: Session) -> None:
+        """Pull documents updated since the watermark, less the overlap window, into the delta."""
+        since = self._watermark - self.refresh_overlap if self._watermark else None
+        ids, vectors, watermark = self._fetch(db, since=since)
+        if not len(ids):
+            return
+        state = self._state
+        # Replace older copies of the same documents in both base and delta
+        keep = ~np.isin(state.delta_ids, ids)
+        self._state = state._replace(
+            base_live=state.base_live & ~np.isin(state.base_ids, ids),
+            delta=np.concatenate([state.delta[keep], vectors]),
+            delta_ids=np.concatenate([state.delta_ids[keep], ids]),
+        )
+        self._watermark = max(watermark, self._watermark) if self._watermark else watermark
+        logger.info(f"Refreshed vector index with {len(ids)} updated documents")
+
+    def _fetch(self, db: Session, since: Optional[datetime]):
+        query = db.query(Document.id, Document.embedding, Document.updated_at).filter(Document.embedding.isnot(None))
+        if since is not None:
+            query = query.filter(Document.updated_at >= since)
+        ids, vectors, watermark = [], [], since
+        for document_id, embedding, updated_at in query.yield_per(5000):
+            ids.append(document_id)
+            vectors.append(np.asarray(embedding, dtype=np.float32))
+            if updated_at and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        if not vectors:
+            return np.empty(0, dtype=np.int64), np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32), watermark
+        matrix = np.vstack(vectors)
+        matrix /= np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+        return np.asarray(ids, dtype=np.int64), matrix, watermark
+
+
+document_vector_index = DocumentVectorIndex()
@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_bulk_import.py
+"""Throughput of the streaming bulk import.
+
+Writes a synthetic JSONL (or CSV) dump of `--documents` records, imports it
+with `app.services.bulk_import.import_stream` and reports documents per
+second. Imported rows use `bench://` source URLs and are removed afterwards.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_bulk_import --documents 100000 --chunk-size 500
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+from app.db.session import SessionLocal
+from app.models.tag import Tag
+from app.services.bulk_import import import_stream
+from benchmarks.synthetic import URL_PREFIX, sentence, remove_documents
+
+
+def write_dump(path: str, fmt: str, count: int, tag_names, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["title", "summary", "source_url", "year_published", "tags"]) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        for i in range(count):
+            record = {
+                "title": sentence(rng, rng.randint(4, 10)),
+                "summary": sentence(rng, rng.randint(40, 80)),
+                "source_url": f"{URL_PREFIX}import/{i}",
+                "year_published": rng.randint(2000, 2025),
+                "tags": rng.sample(tag_names, min(3, len(tag_names))),
+            }
+            if writer:
+                writer.writerow({**record, "tags": ";".join(record["tags"])})
+            else:
+                f.write(json.dumps(record) + "\n")
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    path = os.path.join(tempfile.mkdtemp(), f"bench_import.{args.format}")
+    try:
+        tag_names = [name for (name,) in db.query(Tag.name).all()]
+        write_dump(path, args.format, args.documents, tag_names, args.seed)
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            result = import_stream(db, f, name=os.path.basename(path), size=os.path.getsize(path), chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(json.dumps({**result, "seconds": round(elapsed, 1), "docs_per_second": round(result["imported"] / elapsed, 1)}))
+    finally:
+        db.rollback()
+        if not args.keep:
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the imported documents")
+    main(parser.parse_args())
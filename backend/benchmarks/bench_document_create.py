@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_document_create.py
+"""Round trips and latency of `CRUDDocument.create` by number of tags.
+
+Creates synthetic documents with 1 to N tags, half of them new, and counts
+the SQL statements each create issues; the count should not grow with the
+number of tags. Created documents and tags are removed afterwards.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_document_create --tags 1 5 20 --repeat 20
+"""
+
+import argparse
+import time
+
+from app.crud import crud_document
+from app.db.session import SessionLocal, engine
+from app.models.tag import Tag
+from app.schemas import DocumentCreate
+from app.schemas.tag import Tag as TagSchema
+from benchmarks.common import count_queries, summarize, print_table
+from benchmarks.synthetic import URL_PREFIX, remove_documents
+
+NEW_TAG_PREFIX = "bench-tag-"
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    existing = [name for (name,) in db.query(Tag.name).filter(Tag.name.notlike(f"{NEW_TAG_PREFIX}%")).all()]
+    crud_document.create(db, obj_in=DocumentCreate(title="warm up", source_url=f"{URL_PREFIX}warmup"))
+    try:
+        rows = []
+        for tag_count in args.tags:
+            latencies, statements = [], []
+            for i in range(args.repeat):
+                names = existing[:tag_count - tag_count // 2] + [
+                    f"{NEW_TAG_PREFIX}{tag_count}-{i}-{j}" for j in range(tag_count // 2)
+                ]
+                document_in = DocumentCreate(
+                    title=f"Benchmark document {tag_count}-{i}",
+                    summary="Synthetic document for the create benchmark",
+                    source_url=f"{URL_PREFIX}create/{tag_count}/{i}",
+                    tags=[TagSchema(name=name) for name in names],
+                )
+                with count_queries(engine) as executed:
+                    start = time.perf_counter()
+                    crud_document.create(db, obj_in=document_in)
+                    latencies.append(time.perf_counter() - start)
+                statements.append(len(executed))
+                db.expunge_all()
+            stats = summarize(latencies, sum(latencies))
+            rows.append({"tags": tag_count, "statements": max(statements), "p50_ms": stats["p50_ms"], "p99_ms": stats["p99_ms"]})
+        print_table(rows)
+    finally:
+        db.rollback()
+        remove_documents(db.connection())
+        db.query(Tag).filter(Tag.name.like(f"{NEW_TAG_PREFIX}%")).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tags", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,95 @@
+# backend/benchmarks/bench_document_listing.py
+"""Plan check and latency of `/documents/?search=` on a large library.
+
+Seeds synthetic documents, then for each search term EXPLAINs the first
+page query `CRUDDocument.get_multi` runs, ORDER BY and LIMIT included,
+and checks that Postgres answers it with the pg_trgm GIN indexes rather
+than a sequential or backward primary key scan. Exits non-zero if a plan
+does not use them. Synthetic rows are removed afterwards.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_document_listing --documents 100000
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from app.crud import crud_document
+from app.db.session import SessionLocal
+from benchmarks.common import summarize, print_table
+from benchmarks.synthetic import seed_documents, remove_documents
+
+# Selective phrases; a term in most rows is rightly answered with a seq scan
+TERMS = ["lpg adoption", "induction stove", "carbon credits", "gasifier pellets", "kenya biogas"]
+TRIGRAM_INDEXES = {"ix_document_title_trgm", "ix_document_summary_trgm"}
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db, query):
+    statement = query.statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+    result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}").scalar()
+    plan = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+    return list(plan_nodes(plan))
+
+
+def main(args) -> int:
+    db = SessionLocal()
+    failed = False
+    try:
+        if args.documents:
+            seed_documents(db.connection(), args.documents)
+            db.commit()
+
+        rows = []
+        for term in TERMS:
+            query = crud_document._paged_query(
+                crud_document._list_query(db, search_term=term), skip=0, limit=args.limit, after_id=None
+            )
+            nodes = explain(db, query)
+            indexes = {node.get("Index Name") for node in nodes} & TRIGRAM_INDEXES
+            seq_scan = any(node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "document" for node in nodes)
+            if indexes != TRIGRAM_INDEXES or seq_scan:
+                failed = True
+
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                crud_document.get_multi(db, search_term=term, limit=args.limit)
+                latencies.append(time.perf_counter() - start)
+                db.expunge_all()
+            stats = summarize(latencies, sum(latencies))
+            rows.append({
+                "term": term,
+                "indexes": ",".join(sorted(indexes)) or "-",
+                "seq_scan": seq_scan,
+                "p50_ms": stats["p50_ms"],
+                "p99_ms": stats["p99_ms"],
+            })
+        print_table(rows)
+    finally:
+        if args.documents and not args.keep:
+            db.rollback()
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+
+    if failed:
+        print("Listing search does not use the trigram indexes", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100_000, help="synthetic documents to seed, 0 for none")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic documents")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_document_payload.py
+"""Bytes fetched and latency per page of `/documents/`, by column set.
+
+"all columns" reproduces the mapping before `embedding` and `content` were
+deferred; the other cases are the current default and two sparse
+fieldsets. Bytes are the summed `pg_column_size` of the document rows the
+page query returns (the tag SELECT is the same for every case that loads
+tags). Latency covers the query and serialization, as in the endpoint.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_document_payload --documents 10000
+"""
+
+import argparse
+import time
+
+from sqlalchemy.orm import undefer
+
+from app.api.v1.endpoints.documents import _sparse_response
+from app.crud import crud_document
+from app.db.session import SessionLocal
+from app.models.document import Document
+from app.schemas import Document as DocumentSchema
+from benchmarks.common import summarize, print_table
+from benchmarks.synthetic import seed_documents, remove_documents
+
+CASES = [
+    ("all columns", None, lambda db: crud_document._list_query(db).options(undefer(Document.embedding), undefer(Document.content))),
+    ("deferred", None, lambda db: crud_document._list_query(db)),
+    ("fields=id,title,tags", ["id", "title", "tags"], lambda db: crud_document._list_query(db, fields=["id", "title", "tags"])),
+    ("fields=id,title", ["id", "title"], lambda db: crud_document._list_query(db, fields=["id", "title"])),
+]
+
+
+def page_bytes(db, query) -> int:
+    statement = query.statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+    return db.connection().exec_driver_sql(f"SELECT coalesce(sum(pg_column_size(page.*)), 0) FROM ({statement}) AS page").scalar()
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        if args.documents:
+            seed_documents(db.connection(), args.documents, embeddings=True)
+            db.commit()
+
+        rows = []
+        for name, fields, build in CASES:
+            size = page_bytes(db, build(db).limit(args.limit))
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                documents = build(db).limit(args.limit).all()
+                if fields:
+                    _sparse_response(documents, fields)
+                else:
+                    [DocumentSchema.model_validate(document) for document in documents]
+                latencies.append(time.perf_counter() - start)
+                db.expunge_all()
+            stats = summarize(latencies, sum(latencies))
+            rows.append({"columns": name, "kb_per_page": size / 1024, "p50_ms": stats["p50_ms"], "p99_ms": stats["p99_ms"]})
+        print_table(rows)
+    finally:
+        if args.documents and not args.keep:
+            db.rollback()
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=10_000, help="synthetic documents to seed, 0 for none")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic documents")
+    main(parser.parse_args())
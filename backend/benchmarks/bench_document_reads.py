@@ -0,0 +1,71 @@
+# backend/benchmarks/bench_document_reads.py
+"""Query counts of the document read paths, serialization included.
+
+Seeds synthetic documents, then runs each `CRUDDocument` read path for a
+page of 1 and a page of 100 documents and serializes the result with the
+response schema, as the endpoints do. Every path must issue the same
+number of queries for both page sizes; a lazy `Document.tags` load would
+add one per document. Exits non-zero otherwise.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_document_reads --documents 1000
+"""
+
+import argparse
+import sys
+
+from app.crud import crud_document
+from app.db.session import SessionLocal, engine
+from app.schemas import Document as DocumentSchema
+from benchmarks.common import count_queries, print_table
+from benchmarks.synthetic import seed_documents, remove_documents
+
+PATHS = [
+    ("get_multi", lambda db, limit: crud_document.get_multi(db, limit=limit)),
+    ("get_multi region", lambda db, limit: crud_document.get_multi(db, region="South Asia", limit=limit)),
+    ("get_by_framework", lambda db, limit: crud_document.get_by_framework(db, framework="CUSTOMER_JOURNEY", limit=limit)),
+    ("get", lambda db, limit: [crud_document.get(db, id=crud_document.get_multi(db, limit=1)[0].id)]),
+]
+
+
+def queries_for(db, run, limit: int) -> int:
+    db.expunge_all()
+    with count_queries(engine) as statements:
+        documents = run(db, limit)
+        [DocumentSchema.model_validate(document) for document in documents]
+    return len(statements)
+
+
+def main(args) -> int:
+    db = SessionLocal()
+    failed = False
+    try:
+        if args.documents:
+            seed_documents(db.connection(), args.documents)
+            db.commit()
+
+        rows = []
+        for name, run in PATHS:
+            one, page = queries_for(db, run, 1), queries_for(db, run, args.limit)
+            failed = failed or one != page
+            rows.append({"path": name, "queries_1": one, f"queries_{args.limit}": page})
+        print_table(rows)
+    finally:
+        if args.documents and not args.keep:
+            db.rollback()
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+
+    if failed:
+        print("Query count grows with the page size", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1000, help="synthetic documents to seed, 0 for none")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic documents")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+# backend/benchmarks/bench_embedding_backends.py
+"""Parity, latency, memory and cold-start comparison of the embedding backends.
+
+Each backend runs in a fresh subprocess so cold start and RSS are not
+polluted by the others. Embeddings of a fixed corpus are compared with the
+torch output by cosine similarity; the script exits non-zero if a backend
+falls below its parity threshold.
+
+Export the ONNX models first, then run from the backend directory:
+
+    python -m app.services.embedding_backends
+    python -m benchmarks.bench_embedding_backends --backends torch onnx onnx-int8
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import summarize, print_table
+
+# Minimum mean cosine similarity against torch
+PARITY_THRESHOLDS = {"torch": 1.0, "onnx": 0.9999, "onnx-int8": 0.99}
+
+CORPUS = [
+    "LPG adoption", "carbon finance", "Electric cooking", "Sub-Saharan Africa",
+    "Improved Biomass Stoves", "ISO 19867 stove testing protocol",
+    "Household air pollution from solid fuel use is a leading health risk in low income countries.",
+    "A randomized evaluation of consumer finance offers for LPG cookstoves in rural Kenya.",
+    "Biodigesters convert livestock manure into biogas for cooking and bio-slurry fertilizer.",
+    "Results-based financing mechanisms and their role in scaling clean cooking markets.",
+    "Pay-as-you-go smart meters reduce upfront costs for LPG refills in urban households.",
+    "Ethanol cookstove programs in Mozambique and Ethiopia: supply chain lessons learned.",
+] * 4
+
+
+def run_worker(backend: str, output: str, iterations: int) -> None:
+    start = time.perf_counter()
+    from app.services.embedding_engine import EmbeddingEngine
+
+    engine = EmbeddingEngine(backend=backend)
+    engine.warmup()
+    cold_start = time.perf_counter() - start
+
+    latencies = []
+    for i in range(iterations):
+        text = CORPUS[i % len(CORPUS)]
+        t = time.perf_counter()
+        engine.encode_one(text)
+        latencies.append(time.perf_counter() - t)
+    single = summarize(latencies, sum(latencies))
+
+    t = time.perf_counter()
+    embeddings = engine.encode_many(CORPUS)
+    batch_ms = (time.perf_counter() - t) * 1000
+    np.save(output, embeddings)
+
+    with open("/proc/self/statm") as f:
+        rss_pages = int(f.read().split()[1])
+    print(json.dumps({
+        "backend": backend,
+        "cold_start_s": cold_start,
+        "p50_ms": single["p50_ms"],
+        "p99_ms": single["p99_ms"],
+        "batch_ms": batch_ms,
+        "rss_mb": rss_pages * os.sysconf("SC_PAGE_SIZE") / 2**20,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main(args) -> int:
+    rows, embeddings = [], {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            output = os.path.join(tmp, f"{backend}.npy")
+            result = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_embedding_backends",
+                 "--worker", backend, "--output", output, "--iterations", str(args.iterations)],
+                check=True, capture_output=True, text=True
+            )
+            rows.append(json.loads(result.stdout.strip().splitlines()[-1]))
+            embeddings[backend] = np.load(output)
+
+    failed = False
+    reference = embeddings.get("torch")
+    for row in rows:
+        embedding = embeddings[row["backend"]]
+        row["dim"] = embedding.shape[1]
+        if reference is not None:
+            similarity = cosine_rows(reference, embedding)
+            row["cos_mean"] = float(similarity.mean())
+            row["cos_min"] = float(similarity.min())
+            if row["cos_mean"] < PARITY_THRESHOLDS.get(row["backend"], 0.99) - 1e-6 or row["dim"] != reference.shape[1]:
+                failed = True
+    print_table(rows)
+    if failed:
+        print("Parity check FAILED", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args.worker, args.output, args.iterations)
+    else:
+        sys.exit(main(args))
@@ -0,0 +1,62 @@
+# backend/benchmarks/bench_embedding_batcher.py
+"""Compare per-request query encoding with the micro-batching scheduler.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_embedding_batcher --clients 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.embedding_engine import embedding_engine
+from app.services.embedding_batcher import EmbeddingBatcher
+from benchmarks.common import summarize, print_table
+
+QUERIES = [
+    "LPG adoption", "carbon finance", "improved biomass stoves in Kenya",
+    "electric cooking pilots", "consumer finance for clean cookstoves",
+    "household air pollution health impacts", "ethanol fuel supply chain",
+    "biodigesters Sub-Saharan Africa", "stove testing standards ISO 19867",
+    "gender and clean cooking livelihoods",
+]
+
+
+async def run(encode, clients: int, requests: int):
+    latencies = []
+    remaining = requests
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            text = f"{random.choice(QUERIES)} {random.randint(0, 10**6)}"
+            start = time.perf_counter()
+            await encode(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def main(args):
+    embedding_engine.warmup()
+    rows = [{"mode": "per-request", **await run(embedding_engine.aencode_one, args.clients, args.requests)}]
+    for max_wait_ms in args.max_wait_ms:
+        batcher = EmbeddingBatcher(embedding_engine, max_batch_size=args.max_batch_size, max_wait_ms=max_wait_ms)
+        stats = await run(batcher.encode, args.clients, args.requests)
+        rows.append({"mode": f"batched {max_wait_ms}ms/{args.max_batch_size}", **stats})
+    print_table(rows)
+    embedding_engine.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, nargs="+", default=[2.0, 5.0, 10.0])
+    asyncio.run(main(parser.parse_args()))
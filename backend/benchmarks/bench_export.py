@@ -0,0 +1,70 @@
+# backend/benchmarks/bench_export.py
+"""Throughput and peak memory of the streaming library export.
+
+Seeds synthetic documents, drains `export_documents` for each format and
+reports MB written, rows per second and the growth of peak RSS, which
+should stay flat as `--documents` grows.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_export --documents 200000 --embeddings
+"""
+
+import argparse
+import resource
+import time
+
+from app.db.session import SessionLocal
+from app.models.document import Document
+from app.services.document_export import export_documents, check_export_format
+from benchmarks.common import print_table
+from benchmarks.synthetic import seed_documents, remove_documents
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        if args.documents:
+            seed_documents(db.connection(), args.documents, embeddings=args.embeddings)
+            db.commit()
+        total = db.query(Document).count()
+
+        rows = []
+        for fmt in args.formats:
+            try:
+                check_export_format(fmt)
+            except ValueError as e:
+                print(f"Skipping {fmt}: {e}")
+                continue
+            before = peak_rss_mb()
+            start = time.perf_counter()
+            written = sum(len(chunk) for chunk in export_documents(fmt, include_embeddings=args.embeddings))
+            elapsed = time.perf_counter() - start
+            rows.append({
+                "format": fmt,
+                "rows": total,
+                "mb": written / 1024 / 1024,
+                "rows_per_s": total / elapsed,
+                "peak_rss_growth_mb": peak_rss_mb() - before,
+            })
+        print_table(rows)
+    finally:
+        if args.documents and not args.keep:
+            db.rollback()
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=200_000, help="synthetic documents to seed, 0 for none")
+    parser.add_argument("--formats", nargs="+", default=["ndjson", "csv", "parquet"])
+    parser.add_argument("--embeddings", action="store_true", help="seed and export embeddings")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic documents")
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_import_time.py
+"""Import time of the API and of the modules Alembic loads, against a budget.
+
+Imports each target in a fresh interpreter with `python -X importtime`,
+keeps the fastest of `--repeat` runs and checks it against the budget. It
+also checks which heavy modules got imported: none of the ML stack may be
+loaded by `app.main`, and the Alembic path (`app.db.base`, `app.crud`)
+must not load the services at all. Exits non-zero on any violation.
+Needs no database; settings get placeholder credentials if unset.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_import_time --budget-ms 2500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.common import print_table
+
+ML_MODULES = ["torch", "sentence_transformers", "transformers", "sklearn", "onnxruntime", "tokenizers"]
+# Target -> modules it must not import
+TARGETS = {
+    "app.main": ML_MODULES + ["aiohttp"],
+    "app.db.base": ML_MODULES + ["numpy", "app.crud", "app.services"],
+    "app.crud": ML_MODULES + ["numpy", "app.services"],
+}
+
+
+def import_once(target):
+    """Cumulative import time of `target` in microseconds and the modules it loaded."""
+    env = {"DB_HOST": "unused", "DB_USER": "unused", "DB_PASSWORD": "unused", **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys, {target}; print('\\n'.join(sys.modules))"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if name.strip() == target:
+            cumulative = int(total)
+    return cumulative, set(result.stdout.split())
+
+
+def main(args) -> int:
+    failed = False
+    rows = []
+    for target, forbidden in TARGETS.items():
+        runs = [import_once(target) for _ in range(args.repeat)]
+        best_us = min(cumulative for cumulative, _ in runs)
+        loaded = runs[0][1]
+        leaked = sorted(name for name in forbidden if name in loaded or any(m.startswith(f"{name}.") for m in loaded))
+        over_budget = target == "app.main" and best_us / 1000 > args.budget_ms
+        failed = failed or over_budget or bool(leaked)
+        rows.append({
+            "module": target,
+            "best_ms": best_us / 1000,
+            "modules": len(loaded),
+            "forbidden_loaded": ",".join(leaked) or "-",
+            "over_budget": over_budget,
+        })
+    print_table(rows)
+
+    if failed:
+        print(f"Import check failed (budget for app.main {args.budget_ms:.0f} ms)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=2500.0, help="budget for `import app.main`")
+    parser.add_argument("--repeat", type=int, default=3)
+    sys.exit(main(parser.parse_args()))
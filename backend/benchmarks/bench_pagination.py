@@ -0,0 +1,87 @@
+# backend/benchmarks/bench_pagination.py
+"""Latency of deep listing pages with OFFSET versus keyset cursors.
+
+Seeds synthetic documents and fetches page N of `get_multi` and
+`get_by_framework` both with `skip=N*limit` and with the `after_id` of the
+previous page, as `/documents/?cursor=` does. Keyset pages should cost the
+same at page 1 and page 1000.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pagination --documents 200000 --pages 1 10 100 1000
+"""
+
+import argparse
+import time
+
+from app.crud import crud_document
+from app.db.session import SessionLocal
+from benchmarks.common import summarize, print_table
+from benchmarks.synthetic import seed_documents, remove_documents
+
+PATHS = [
+    ("get_multi", lambda db, **kwargs: crud_document.get_multi(db, **kwargs)),
+    ("get_by_framework", lambda db, **kwargs: crud_document.get_by_framework(db, framework="CUSTOMER_JOURNEY", **kwargs)),
+]
+
+
+def walk_to(db, run, page: int, limit: int):
+    """The after_id that starts `page` (1-based), found by following cursors."""
+    after_id = None
+    for _ in range(page - 1):
+        documents = run(db, limit=limit, after_id=after_id)
+        if not documents:
+            break
+        after_id = documents[-1].id
+        db.expunge_all()
+    return after_id
+
+
+def time_page(db, run, repeat: int, **kwargs):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(db, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        db.expunge_all()
+    return summarize(latencies, sum(latencies))
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        if args.documents:
+            seed_documents(db.connection(), args.documents)
+            db.commit()
+
+        rows = []
+        for name, run in PATHS:
+            for page in args.pages:
+                offset = time_page(db, run, args.repeat, skip=(page - 1) * args.limit, limit=args.limit)
+                after_id = walk_to(db, run, page, args.limit)
+                keyset = time_page(db, run, args.repeat, limit=args.limit, after_id=after_id)
+                rows.append({
+                    "path": name,
+                    "page": page,
+                    "offset_p50_ms": offset["p50_ms"],
+                    "cursor_p50_ms": keyset["p50_ms"],
+                    "offset_p99_ms": offset["p99_ms"],
+                    "cursor_p99_ms": keyset["p99_ms"],
+                })
+        print_table(rows)
+    finally:
+        if args.documents and not args.keep:
+            db.rollback()
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=200_000, help="synthetic documents to seed, 0 for none")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic documents")
+    main(parser.parse_args())
@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_search_paging.py
+"""Latency of deep semantic-search pages with skip versus the continuation cursor.
+
+"skip" is the nearest-neighbour query with an OFFSET, which ranks and
+discards every earlier row. "cursor" is `get_ids_by_text_embedding(after=...)` resumed
+from the last distance of the previous page, excluding the rows shown at
+that distance, as a `next_cursor` continuation does. Query vectors are taken from existing embeddings.
+
+Run from the backend directory against a populated database:
+
+    python -m benchmarks.bench_search_paging --pages 1 5 20 50 --limit 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.crud import crud_document
+from app.db.session import SessionLocal
+from app.models.document import Document
+from benchmarks.common import summarize, print_table
+
+
+def skip_query(db, query_embedding, skip, limit):
+    distance = Document.embedding.cosine_distance(query_embedding).label("relevance_score")
+    return (
+        crud_document._nearest_query(db, Document.id, distance, filters=None, ef_search=None, page_end=skip + limit)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        queries = [
+            np.asarray(row[0], dtype=np.float32)
+            for row in db.query(Document.embedding).filter(Document.embedding.isnot(None)).limit(args.queries).all()
+        ]
+        if not queries:
+            raise SystemExit("No document embeddings found")
+
+        rows = []
+        for page in args.pages:
+            skip_latencies, cursor_latencies = [], []
+            for query in queries:
+                # Walk the cursor to the start of the page first, untimed
+                after, seen, depth = None, {}, 0
+                for _ in range(page - 1):
+                    hits = crud_document.get_ids_by_text_embedding(
+                        db, query_embedding=query, limit=args.limit, after=after, exclude_ids=list(seen), depth=depth
+                    )
+                    db.rollback()
+                    if not hits:
+                        break
+                    after = hits[-1][1]
+                    depth += sum(1 for _, distance in [*seen.items(), *hits] if distance < after)
+                    seen = {document_id: distance for document_id, distance in [*seen.items(), *hits] if distance >= after}
+
+                start = time.perf_counter()
+                skip_query(db, query, (page - 1) * args.limit, args.limit)
+                skip_latencies.append(time.perf_counter() - start)
+                db.rollback()
+
+                start = time.perf_counter()
+                crud_document.get_ids_by_text_embedding(
+                    db, query_embedding=query, limit=args.limit, after=after, exclude_ids=list(seen), depth=depth
+                )
+                cursor_latencies.append(time.perf_counter() - start)
+                db.rollback()
+
+            skip_stats = summarize(skip_latencies, sum(skip_latencies))
+            cursor_stats = summarize(cursor_latencies, sum(cursor_latencies))
+            rows.append({
+                "page": page,
+                "skip_p50_ms": skip_stats["p50_ms"],
+                "cursor_p50_ms": cursor_stats["p50_ms"],
+                "skip_p99_ms": skip_stats["p99_ms"],
+                "cursor_p99_ms": cursor_stats["p99_ms"],
+            })
+        print_table(rows)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50])
+    parser.add_argument("--limit", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_semantic_query.py
+"""Latency of the semantic search query before and after the rewrite.
+
+"literal-join" is the previous query: the vector inlined as an SQL literal
+twice and an inner join on document tags. "bound" is the current
+`CRUDDocument.get_ids_by_text_embedding` followed by `get_by_ids`, as the
+search service loads its results. Query vectors are taken from
+existing document embeddings, perturbed slightly.
+
+Run from the backend directory against a populated database:
+
+    python -m benchmarks.bench_semantic_query --queries 200 --limit 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sqlalchemy import func, text
+
+from app.crud import crud_document
+from app.db.session import SessionLocal
+from app.models.document import Document
+from benchmarks.common import summarize, print_table
+
+
+def literal_join_query(db, query_embedding, limit):
+    embedding = [float(v) for v in query_embedding]
+    results = (
+        db.query(
+            Document,
+            func.cosine_distance(Document.embedding, text(f"'{embedding}'::vector")).label('relevance_score')
+        )
+        .join(Document.tags)
+        .order_by(func.cosine_distance(Document.embedding, text(f"'{embedding}'::vector")))
+        .limit(limit)
+        .all()
+    )
+    # Touch tags as the search service does
+    for document, _ in results:
+        list(document.tags)
+    return results
+
+
+def bound_query(db, query_embedding, limit):
+    hits = crud_document.get_ids_by_text_embedding(db, query_embedding=query_embedding, limit=limit)
+    results = crud_document.get_by_ids(db, ids=[document_id for document_id, _ in hits])
+    for document in results:
+        list(document.tags)
+    return results
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    db = SessionLocal()
+    try:
+        sample = [
+            np.asarray(row[0], dtype=np.float32)
+            for row in db.query(Document.embedding).filter(Document.embedding.isnot(None)).limit(args.queries).all()
+        ]
+        if not sample:
+            raise SystemExit("No document embeddings found")
+        queries = [
+            sample[i % len(sample)] + 0.01 * rng.standard_normal(sample[0].shape).astype(np.float32)
+            for i in range(args.queries)
+        ]
+
+        rows = []
+        for name, run in (("literal-join", literal_join_query), ("bound", bound_query)):
+            run(db, queries[0], args.limit)  # warm up
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                run(db, query, args.limit)
+                latencies.append(time.perf_counter() - start)
+                db.rollback()
+                db.expunge_all()
+            rows.append({"query": name, **summarize(latencies, sum(latencies))})
+        print_table(rows)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
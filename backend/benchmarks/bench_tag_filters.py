@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_tag_filters.py
+"""Framework, region and multi-tag filter latency with and without the document_tags keys.
+
+Seeds synthetic documents, times `get_by_framework`, `get_multi(region=...)`
+and `get_multi(tags=[...])` with one and five tags in both match modes,
+with the primary key and reverse index in place, then drops both inside a
+transaction, times again and rolls back, so the schema is left untouched.
+Tag filters go through the `tag_ids` GIN index, so five tags should cost
+about the same as one.
+
+Run from the backend directory after `alembic upgrade head`:
+
+    python -m benchmarks.bench_tag_filters --documents 100000
+"""
+
+import argparse
+import time
+
+from app.crud import crud_document
+from app.schemas.search import TagMatch
+from app.db.session import SessionLocal
+from benchmarks.common import summarize, print_table
+from benchmarks.synthetic import seed_documents, remove_documents
+
+FIVE_TAGS = ["LPG", "Adoption", "Sub-Saharan Africa", "Consumer Finance", "Growth"]
+
+CASES = [
+    ("framework customer-journey", lambda db, limit: crud_document.get_by_framework(db, framework="CUSTOMER_JOURNEY", limit=limit)),
+    ("framework product-lifecycle", lambda db, limit: crud_document.get_by_framework(db, framework="PRODUCT_LIFECYCLE", limit=limit)),
+    ("region Sub-Saharan Africa", lambda db, limit: crud_document.get_multi(db, region="Sub-Saharan Africa", limit=limit)),
+    ("region South Asia", lambda db, limit: crud_document.get_multi(db, region="South Asia", limit=limit)),
+    ("1 tag", lambda db, limit: crud_document.get_multi(db, tags=FIVE_TAGS[:1], limit=limit)),
+    ("5 tags all", lambda db, limit: crud_document.get_multi(db, tags=FIVE_TAGS, limit=limit)),
+    ("5 tags any", lambda db, limit: crud_document.get_multi(db, tags=FIVE_TAGS, tag_match=TagMatch.ANY, limit=limit)),
+]
+
+
+def time_cases(db, label, args):
+    rows = []
+    for name, run in CASES:
+        latencies = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            documents = run(db, args.limit)
+            for document in documents:
+                list(document.tags)
+            latencies.append(time.perf_counter() - start)
+            db.expunge_all()
+        stats = summarize(latencies, sum(latencies))
+        rows.append({"keys": label, "case": name, "p50_ms": stats["p50_ms"], "p99_ms": stats["p99_ms"]})
+    return rows
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        if args.documents:
+            seed_documents(db.connection(), args.documents)
+            db.commit()
+
+        rows = time_cases(db, "pk + reverse index", args)
+
+        connection = db.connection()
+        connection.exec_driver_sql("DROP INDEX ix_document_tags_tag_id_document_id")
+        connection.exec_driver_sql("ALTER TABLE document_tags DROP CONSTRAINT document_tags_pkey")
+        connection.exec_driver_sql("ANALYZE document_tags")
+        rows += time_cases(db, "no keys", args)
+        db.rollback()
+
+        print_table(rows)
+    finally:
+        db.rollback()
+        if args.documents and not args.keep:
+            remove_documents(db.connection())
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100_000, help="synthetic documents to seed, 0 for none")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic documents")
+    main(parser.parse_args())
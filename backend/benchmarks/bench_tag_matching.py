@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_tag_matching.py
+"""CPU time of tagging external results, per request.
+
+"per-tag loop" is the previous code path: fetch the whole tag table for
+every result and compute one cosine similarity per tag in Python.
+"matrix" is `TagMatrix.match`, one matrix multiply against the cached,
+normalized tag matrix. Summary embeddings are random unit vectors, so only
+the timing is meaningful.
+
+Run from the backend directory against a database with seeded tags:
+
+    python -m benchmarks.bench_tag_matching --results 10 --repeat 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.tag import Tag
+from app.services.tag_matrix import TagMatrix
+from benchmarks.common import summarize, print_table
+
+
+def per_tag_loop(db, summaries):
+    matched = []
+    for summary in summaries:
+        tags = []
+        for tag in db.query(Tag).all():
+            if tag.embedding is None:
+                continue
+            embedding = np.asarray(tag.embedding, dtype=np.float32)
+            similarity = float(summary @ embedding / (np.linalg.norm(summary) * np.linalg.norm(embedding)))
+            if similarity >= settings.TAG_MATCH_THRESHOLD:
+                tags.append(tag.name)
+        matched.append(tags)
+        db.expunge_all()
+    return matched
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    db = SessionLocal()
+    matrix = TagMatrix()
+    try:
+        matrix.get(db)  # warm the cache as a running server would have
+        rows = []
+        for name, run in (("per-tag loop", lambda s: per_tag_loop(db, s)), ("matrix", lambda s: matrix.match(db, s))):
+            latencies = []
+            for _ in range(args.repeat):
+                summaries = rng.standard_normal((args.results, settings.EMBEDDING_DIMENSION)).astype(np.float32)
+                start = time.perf_counter()
+                run(summaries)
+                latencies.append(time.perf_counter() - start)
+            rows.append({"path": name, **summarize(latencies, sum(latencies))})
+        print_table(rows)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=10, help="external results per request")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
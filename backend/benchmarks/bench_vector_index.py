@@ -0,0 +1,153 @@
+# backend/benchmarks/bench_vector_index.py
+"""Recall@k and latency of the HNSW index against an exact scan.
+
+Builds a scratch table of synthetic, clustered 384-dim embeddings at each
+requested size, indexes it like `document.embedding`, and compares the
+ANN top-k for several ef_search values with the exact top-k. The scratch
+table is dropped afterwards.
+
+First it EXPLAINs the nearest-neighbour query `CRUDDocument` builds on the
+real document table, for a first page and for a cursor continuation, and
+exits non-zero unless both are served by the HNSW index. Postgres before
+17 only uses it when the distance is the sole ORDER BY key.
+
+Run from the backend directory against a pgvector database:
+
+    python -m benchmarks.bench_vector_index --sizes 10000 100000 1000000
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from app.crud import crud_document
+from app.db.session import SessionLocal, engine
+from app.models.document import Document
+from benchmarks.common import summarize, print_table
+
+TABLE = "bench_vector_index"
+DIM = 384
+HNSW_INDEX = "ix_document_embedding_hnsw"
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def check_document_plans(rng: np.random.Generator) -> bool:
+    """EXPLAIN the document nearest-neighbour queries; True if all use the HNSW index."""
+    query_embedding = synthetic_embeddings(1, rng)[0].tolist()
+    cosine_distance = Document.embedding.cosine_distance(query_embedding)
+    cases = {
+        "first page": [],
+        "continuation": [cosine_distance >= 0.2, Document.id.notin_([1, 2, 3])],
+    }
+    db = SessionLocal()
+    ok = True
+    try:
+        for name, keyset in cases.items():
+            query = crud_document._nearest_query(
+                db, Document.id, cosine_distance.label("relevance_score"),
+                filters=None, ef_search=None, page_end=10, extra_conditions=keyset
+            ).limit(10)
+            statement = query.statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+            result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}").scalar()
+            plan = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+            uses_index = any(node.get("Index Name") == HNSW_INDEX for node in plan_nodes(plan))
+            print(f"  {name}: {'HNSW index scan' if uses_index else 'no HNSW index scan'}")
+            ok = ok and uses_index
+            db.rollback()
+    finally:
+        db.close()
+    return ok
+
+
+def synthetic_embeddings(n: int, rng: np.random.Generator, clusters: int = 256) -> np.ndarray:
+    """Clustered unit vectors, closer to real text embeddings than uniform noise."""
+    centers = rng.standard_normal((clusters, DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.35 * rng.standard_normal((n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def load_table(conn, vectors: np.ndarray) -> None:
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {TABLE}")
+    conn.exec_driver_sql(f"CREATE TABLE {TABLE} (id integer PRIMARY KEY, embedding vector({DIM}))")
+    cursor = conn.connection.cursor()
+    for start in range(0, len(vectors), 50_000):
+        buffer = io.StringIO()
+        for offset, vector in enumerate(vectors[start:start + 50_000]):
+            buffer.write(f"{start + offset}\t[{','.join(f'{v:.6f}' for v in vector)}]\n")
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {TABLE} (id, embedding) FROM STDIN", buffer)
+    start = time.perf_counter()
+    conn.exec_driver_sql(
+        f"CREATE INDEX ON {TABLE} USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+    print(f"  index build: {time.perf_counter() - start:.1f}s")
+    conn.exec_driver_sql(f"ANALYZE {TABLE}")
+
+
+def top_k(conn, query: np.ndarray, k: int, exact: bool, ef_search: int = 40):
+    settings = "SET LOCAL enable_indexscan = off" if exact else f"SET LOCAL hnsw.ef_search = {ef_search}"
+    with conn.begin_nested():
+        conn.exec_driver_sql(settings)
+        start = time.perf_counter()
+        rows = conn.execute(
+            text(f"SELECT id FROM {TABLE} ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k"),
+            {"q": "[" + ",".join(f"{v:.6f}" for v in query) + "]", "k": k}
+        ).fetchall()
+        elapsed = time.perf_counter() - start
+    return [row[0] for row in rows], elapsed
+
+
+def main(args) -> int:
+    rng = np.random.default_rng(args.seed)
+    print("Document query plans")
+    plans_ok = check_document_plans(rng)
+    rows = []
+    with engine.connect() as conn:
+        with conn.begin():
+            for size in args.sizes:
+                print(f"Loading {size} vectors")
+                load_table(conn, synthetic_embeddings(size, rng))
+                queries = synthetic_embeddings(args.queries, rng)
+
+                exact, exact_latencies = [], []
+                for query in queries:
+                    ids, elapsed = top_k(conn, query, args.k, exact=True)
+                    exact.append(set(ids))
+                    exact_latencies.append(elapsed)
+                rows.append({"rows": size, "mode": "exact", "recall": 1.0, **summarize(exact_latencies, sum(exact_latencies))})
+
+                for ef_search in args.ef_search:
+                    hits, latencies = 0, []
+                    for query, truth in zip(queries, exact):
+                        ids, elapsed = top_k(conn, query, args.k, exact=False, ef_search=ef_search)
+                        hits += len(truth.intersection(ids))
+                        latencies.append(elapsed)
+                    recall = hits / (args.k * len(queries))
+                    rows.append({"rows": size, "mode": f"hnsw ef={ef_search}", "recall": recall, **summarize(latencies, sum(latencies))})
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {TABLE}")
+    print(f"recall@{args.k}")
+    print_table(rows)
+
+    if not plans_ok:
+        print("Nearest-neighbour queries on document do not use the HNSW index", file=sys.stderr)
+    return 0 if plans_ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 20, 40, 80, 160])
+    parser.add_argument("--seed", type=int, default=42)
+    sys.exit(main(parser.parse_args()))
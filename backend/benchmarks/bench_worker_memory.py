@@ -0,0 +1,116 @@
+# backend/benchmarks/bench_worker_memory.py
+"""Per-worker memory of the gunicorn server with and without the preloaded master.
+
+Starts gunicorn twice on a local port with `--workers` uvicorn workers:
+once with gunicorn.conf.py, where the master loads the model and tag matrix
+before forking, and once without it, where every worker loads its own copy
+on startup. After the server answers /health and settles, it reads
+/proc/<pid>/smaps_rollup of the master and each worker and reports RSS, PSS
+(RSS with shared pages split between the processes sharing them) and
+private memory. The PSS total is what the server actually costs. Linux only;
+needs the database the app is configured for.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_worker_memory --workers 4
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.common import print_table
+
+MODES = {
+    "preload": ["-c", "gunicorn.conf.py"],
+    # An empty config file, or gunicorn picks up ./gunicorn.conf.py by itself
+    "per worker": ["-c", os.devnull, "--worker-class", "uvicorn.workers.UvicornWorker"],
+}
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, the fields after it do not
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def memory_mb(pid):
+    """RSS, PSS and private memory of a process in MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def wait_until_ready(server, url, workers, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200 and len(children(server.pid)) >= workers:
+                    return
+        except OSError:
+            pass
+        time.sleep(1)
+    raise RuntimeError(f"gunicorn was not ready within {timeout}s")
+
+
+def measure(mode, args):
+    bind = f"127.0.0.1:{args.port}"
+    command = [sys.executable, "-m", "gunicorn", *MODES[mode], "--bind", bind, "--workers", str(args.workers), "app.main:app"]
+    server = subprocess.Popen(command)
+    try:
+        wait_until_ready(server, f"http://{bind}/health", args.workers, args.startup_timeout)
+        # Every worker has to finish its own startup, not just the first to answer
+        time.sleep(args.settle)
+        rows = [{"mode": mode, "process": "master", **memory_mb(server.pid)}]
+        for i, pid in enumerate(children(server.pid)):
+            rows.append({"mode": mode, "process": f"worker {i}", **memory_mb(pid)})
+        rows.append({
+            "mode": mode,
+            "process": "total",
+            **{key: sum(row[key] for row in rows) for key in ("rss_mb", "pss_mb", "private_mb")},
+        })
+        return rows
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main(args) -> None:
+    rows = []
+    for mode in MODES:
+        rows += measure(mode, args)
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-timeout", type=float, default=300.0, help="seconds to wait for /health")
+    parser.add_argument("--settle", type=float, default=10.0, help="seconds to wait after /health answers")
+    main(parser.parse_args())
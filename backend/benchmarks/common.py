@@ -0,0 +1,57 @@
+# backend/benchmarks/common.py
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import event
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize per-call latencies (seconds) and wall time into p50/p99/QPS."""
+    values = np.asarray(latencies) * 1000
+    return {
+        "calls": len(latencies),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "qps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    """Print a list of result dicts as an aligned table."""
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    cells = [[f"{row[c]:.2f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+@contextmanager
+def timer():
+    """Yield a dict whose 'elapsed' key holds the block's wall time in seconds."""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["elapsed"] = time.perf_counter() - start
+
+
+@contextmanager
+def count_queries(engine):
+    """Yield a list that collects every SQL statement run on `engine` in the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
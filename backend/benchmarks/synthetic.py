@@ -0,0 +1,78 @@
+# backend/benchmarks/synthetic.py
+"""Synthetic library rows for database benchmarks.
+
+Rows are bulk-loaded with COPY, marked with a `bench://` source_url and
+removed again by `remove_documents`.
+"""
+
+import io
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+URL_PREFIX = "bench://"
+
+WORDS = (
+    "clean cooking stove fuel adoption household air pollution biomass charcoal lpg ethanol "
+    "electric induction biogas pellets gasifier finance carbon credits market rural urban "
+    "women health emissions kenya uganda india ghana nigeria rwanda policy standards testing "
+    "consumer segmentation livelihoods monitoring evaluation supply chain subsidy distribution"
+).split()
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+
+def seed_documents(conn, count: int, *, tags_per_document: int = 3, embeddings: bool = False, seed: int = 42) -> None:
+    """Insert `count` synthetic documents with random tags from the tag table."""
+    rng = random.Random(seed)
+    vectors = np.random.default_rng(seed)
+    tag_ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM tag").fetchall()]
+    first_id = conn.exec_driver_sql("SELECT coalesce(max(id), 0) + 1 FROM document").scalar()
+    cursor = conn.connection.cursor()
+    now = datetime.utcnow()
+
+    for start in range(0, count, 20_000):
+        documents, links = io.StringIO(), io.StringIO()
+        for i in range(start, min(start + 20_000, count)):
+            document_id = first_id + i
+            updated_at = now - timedelta(minutes=count - i)
+            document_tag_ids = sorted(rng.sample(tag_ids, min(tags_per_document, len(tag_ids))))
+            embedding = "\\N"
+            if embeddings:
+                vector = vectors.standard_normal(384)
+                vector /= np.linalg.norm(vector)
+                embedding = "[" + ",".join(f"{v:.5f}" for v in vector) + "]"
+            documents.write("\t".join([
+                str(document_id),
+                sentence(rng, rng.randint(4, 10)),
+                sentence(rng, rng.randint(40, 80)),
+                f"{URL_PREFIX}{document_id}",
+                str(rng.randint(2000, 2025)),
+                updated_at.isoformat(),
+                updated_at.isoformat(),
+                embedding,
+                "{" + ",".join(map(str, document_tag_ids)) + "}",
+            ]) + "\n")
+            for tag_id in document_tag_ids:
+                links.write(f"{document_id}\t{tag_id}\n")
+        documents.seek(0)
+        links.seek(0)
+        cursor.copy_expert(
+            "COPY document (id, title, summary, source_url, year_published, created_at, updated_at, embedding, tag_ids) FROM STDIN",
+            documents
+        )
+        cursor.copy_expert("COPY document_tags (document_id, tag_id) FROM STDIN", links)
+    conn.exec_driver_sql("SELECT setval(pg_get_serial_sequence('document', 'id'), (SELECT max(id) FROM document))")
+    conn.exec_driver_sql("ANALYZE document")
+    conn.exec_driver_sql("ANALYZE document_tags")
+
+
+def remove_documents(conn) -> None:
+    """Delete every synthetic document and its tag links."""
+    conn.exec_driver_sql(
+        f"DELETE FROM document_tags WHERE document_id IN (SELECT id FROM document WHERE source_url LIKE '{URL_PREFIX}%')"
+    )
+    conn.exec_driver_sql(f"DELETE FROM document WHERE source_url LIKE '{URL_PREFIX}%'")
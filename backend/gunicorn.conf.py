@@ -0,0 +1,51 @@
+# backend/gunicorn.conf.py
+"""Production server: gunicorn master with preforked uvicorn workers.
+
+The app is imported once in the master (`preload_app`), which also loads the
+embedding model and the tag matrix, and the memory vector index when
+SEARCH_BACKEND is "memory", before any worker is forked. Workers share those
+pages copy-on-write instead of each loading their own copy.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+`kill -HUP <master pid>` replaces the workers gracefully, letting in-flight
+requests finish within WEB_GRACEFUL_TIMEOUT. Workers are forked from the
+preloaded master, so new code or a new model needs a restart of the master.
+"""
+
+import gc
+
+from app.core.config import settings
+
+# Collections in the master would touch, and so copy, the objects workers share
+gc.disable()
+
+bind = settings.WEB_BIND
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = settings.WEB_TIMEOUT
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT
+
+
+def when_ready(server):
+    """Warm the shared state in the master, then freeze it for the forks."""
+    from app.db.session import SessionLocal, engine
+    from app.services.embedding_engine import embedding_engine
+    from app.services.tag_matrix import tag_matrix
+    from app.services.vector_index import document_vector_index
+
+    embedding_engine.warmup()
+    db = SessionLocal()
+    try:
+        tag_matrix.get(db)
+        if settings.SEARCH_BACKEND == "memory":
+            document_vector_index.ensure_fresh(db, force=True)
+    finally:
+        db.close()
+    # Workers open their own connections; pooled sockets must not be inherited
+    engine.dispose()
+
+    gc.freeze()
+    gc.enable()
+    server.log.info(f"Shared state loaded, forking {workers} workers")
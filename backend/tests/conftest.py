@@ -0,0 +1,29 @@
+# backend/tests/conftest.py
+
+import os
+
+import pytest
+
+# Settings require database credentials; tests that need a database skip without one
+for name in ("DB_HOST", "DB_USER", "DB_PASSWORD"):
+    os.environ.setdefault(name, "unused")
+
+
+@pytest.fixture
+def db():
+    """A session on the configured database, rolled back afterwards."""
+    from sqlalchemy.exc import OperationalError
+
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        session.connection()
+    except OperationalError:
+        session.close()
+        pytest.skip("database not reachable")
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
@@ -0,0 +1,13 @@
+# backend/tests/helpers.py
+
+from contextlib import contextmanager
+
+from benchmarks.common import count_queries
+
+
+@contextmanager
+def assert_max_queries(engine, limit):
+    """Fail if the block runs more than `limit` SQL statements on `engine`."""
+    with count_queries(engine) as statements:
+        yield statements
+    assert len(statements) <= limit, f"{len(statements)} queries, expected at most {limit}:\n" + "\n".join(statements)
@@ -0,0 +1,70 @@
+# backend/tests/test_bulk_import.py
+
+import io
+
+import pytest
+
+from app.services import bulk_import
+from app.services.bulk_import import BulkImporter, detect_format, iter_records, to_document
+
+
+def test_to_document_from_csv_row():
+    document = to_document({
+        "title": " Improved cookstoves ", "url": "https://example.org/a", "year": "2019",
+        "tags": "Kenya; LPG|", "resource_type": "not a type",
+    })
+    assert document.title == "Improved cookstoves"
+    assert document.source_url == "https://example.org/a"
+    assert document.year_published == 2019
+    assert document.resource_type is None
+    assert [tag.name for tag in document.tags] == ["Kenya", "LPG"]
+
+
+def test_to_document_from_jsonl_line():
+    document = to_document(
+        '{"title": "Biogas", "source_url": "https://example.org/b", "tags": ["Kenya", {"name": "LPG"}]}'
+    )
+    assert document.year_published is None
+    assert [tag.name for tag in document.tags] == ["Kenya", "LPG"]
+
+
+@pytest.mark.parametrize("line", ["{not json", "[1, 2]"])
+def test_to_document_invalid_line(line):
+    with pytest.raises(ValueError):
+        to_document(line)
+
+
+@pytest.mark.parametrize("filename, fmt", [
+    ("library.csv", "csv"), ("library.TSV", "tsv"), ("library.ndjson", "jsonl"), ("export.txt", "csv"),
+])
+def test_detect_format(filename, fmt):
+    assert detect_format(filename) == fmt
+
+
+def test_detect_format_unknown():
+    with pytest.raises(ValueError):
+        detect_format("library.xlsx")
+
+
+def test_iter_records_tsv():
+    stream = io.StringIO("title\tsource_url\ttags\nStoves, improved\thttps://example.org/a\tLPG\n")
+    assert list(iter_records(stream, "tsv")) == [
+        {"title": "Stoves, improved", "source_url": "https://example.org/a", "tags": "LPG"}
+    ]
+
+
+def test_malformed_lines_are_skipped(monkeypatch):
+    monkeypatch.setattr(bulk_import.crud_document, "bulk_upsert", lambda db, documents_in: len(documents_in))
+    stream = io.StringIO(
+        '{"title": "A", "source_url": "https://example.org/a"}\n'
+        '{broken\n'
+        '\n'
+        '{"title": "", "source_url": "https://example.org/c"}\n'
+        '{"title": "D", "source_url": "https://example.org/d"}\n'
+    )
+    class Session:
+        def commit(self):
+            pass
+
+    result = BulkImporter(chunk_size=2).run(Session(), iter_records(stream, "jsonl"), "test")
+    assert result == {"imported": 2, "skipped": 2, "records": 4}
@@ -0,0 +1,18 @@
+# backend/tests/test_cursor.py
+
+import pytest
+
+from app.core.cursor import decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    position = {"after": 0.25, "seen": [[3, 0.5]], "query": "clean cookstoves"}
+    cursor = encode_cursor(position)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", encode_cursor([1, 2])[:-2], encode_cursor([1, 2])])
+def test_malformed(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,13 @@
+# backend/tests/test_document_reads.py
+
+from app.crud import crud_document
+from app.db.session import engine
+from tests.helpers import assert_max_queries
+
+
+def test_document_page_loads_tags_in_one_query(db):
+    # The documents, then their tags through selectinload
+    with assert_max_queries(engine, 2):
+        documents = crud_document.get_multi(db, limit=100)
+        for document in documents:
+            list(document.tags)
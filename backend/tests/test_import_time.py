@@ -0,0 +1,10 @@
+# backend/tests/test_import_time.py
+
+import argparse
+
+from benchmarks import bench_import_time
+
+
+def test_import_time_budget(capsys):
+    args = argparse.Namespace(budget_ms=2500.0, repeat=1)
+    assert bench_import_time.main(args) == 0, capsys.readouterr().out
@@ -0,0 +1,38 @@
+# backend/tests/test_query_cache.py
+
+import pytest
+
+from app.services.query_cache import QueryEmbeddingCache, normalize_query
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Clean  Cookstoves", "clean cookstoves"),
+    ("  biogas\tdigesters\n", "biogas digesters"),
+    ("ＬＰＧ", "lpg"),
+    ("Straße", "strasse"),
+])
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_cache_hits_normalized_query():
+    cache = QueryEmbeddingCache(persist=None)
+    cache.set("Clean Cookstoves", [1.0, 2.0])
+    assert cache.get("clean  cookstoves") == [1.0, 2.0]
+    assert cache.get("biogas") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_file_flushes_from_workers_merge(tmp_path):
+    path = str(tmp_path / "query_cache.npz")
+    first = QueryEmbeddingCache(persist="file", path=path, model_name="test")
+    second = QueryEmbeddingCache(persist="file", path=path, model_name="test")
+    first.set("lpg", [1.0, 0.0])
+    first.flush()
+    second.set("biogas", [0.0, 1.0])
+    second.flush()
+
+    loaded = QueryEmbeddingCache(persist="file", path=path, model_name="test")
+    loaded.load()
+    assert loaded.get("lpg") == [1.0, 0.0]
+    assert loaded.get("biogas") == [0.0, 1.0]
@@ -0,0 +1,75 @@
+# backend/tests/test_search_service.py
+
+import pytest
+
+from app.core.cursor import encode_cursor, decode_cursor
+from app.services.search_service import SearchService, reciprocal_rank_fusion
+
+
+@pytest.fixture
+def service():
+    return SearchService()
+
+
+def cursor_for(service, **overrides):
+    return encode_cursor({
+        "query": "biogas",
+        "model": service.query_cache.model_name,
+        "filters": {},
+        "after": 0.2,
+        "depth": 4,
+        "seen": [[7, 0.2]],
+        **overrides,
+    })
+
+
+def test_rrf_sums_reciprocal_ranks():
+    assert reciprocal_rank_fusion([[1, 2, 3], [3, 1]], k=60) == [1, 3, 2]
+
+
+def test_rrf_breaks_ties_by_id():
+    assert reciprocal_rank_fusion([[5, 4], [4, 5]]) == [4, 5]
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_decode_search_cursor(service):
+    position = service._decode_search_cursor(cursor_for(service, after="0.5", depth=-3))
+    assert position["after"] == 0.5
+    assert position["depth"] == 0
+    assert position["seen"] == [(7, 0.2)]
+
+
+@pytest.mark.parametrize("overrides", [
+    {"seen": [[7]]},
+    {"after": "far"},
+    {"depth": None},
+    {"query": 3},
+    {"filters": {"year": "recent"}},
+])
+def test_decode_search_cursor_invalid(service, overrides):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        service._decode_search_cursor(cursor_for(service, **overrides))
+
+
+def test_decode_search_cursor_missing_key(service):
+    position = decode_cursor(cursor_for(service))
+    del position["depth"]
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        service._decode_search_cursor(encode_cursor(position))
+
+
+def test_decode_search_cursor_other_model(service):
+    with pytest.raises(ValueError, match="different embedding model"):
+        service._decode_search_cursor(cursor_for(service, model="other"))
+
+
+def test_first_page_cursor(service):
+    vector_hits = [(1, 0.1), (2, 0.2), (3, 0.2), (4, 0.3)]
+    # 1 and 2 lead the fused page, 3 is missing from it, 9 came from full-text search
+    document_ids = [1, 9, 2, 4]
+    distances = {**dict(vector_hits), 9: 0.5}
+    position = decode_cursor(service._first_page_cursor("Biogas ", None, vector_hits, document_ids, distances))
+    assert position["query"] == "biogas"
+    assert position["after"] == 0.2
+    assert position["depth"] == 1
+    assert sorted(position["seen"]) == [[2, 0.2], [4, 0.3], [9, 0.5]]
@@ -0,0 +1,59 @@
+# backend/tests/test_vector_index.py
+
+import numpy as np
+import pytest
+
+from app.services.vector_index import DocumentVectorIndex, _IndexState
+
+
+@pytest.fixture
+def index(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(6, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    # Five duplicates of the first vector, then five distinct ones
+    base = np.concatenate([np.repeat(vectors[:1], 5, axis=0), vectors[1:]])
+    index = DocumentVectorIndex(str(tmp_path))
+    index._state = _IndexState(
+        base, np.arange(1, 11, dtype=np.int64), np.ones(10, dtype=bool),
+        np.empty((0, 8), dtype=np.float32), np.empty(0, dtype=np.int64)
+    )
+    return index, vectors[0]
+
+
+def walk(index, query, limit, **kwargs):
+    """Page through the index as the search cursor does."""
+    after, seen, ids = None, {}, []
+    while True:
+        hits = index.search(query, limit, after=after, exclude_ids=list(seen), **kwargs)
+        ids += [document_id for document_id, _ in hits]
+        if len(hits) < limit:
+            return ids
+        after = hits[-1][1]
+        seen = {document_id: distance for document_id, distance in [*seen.items(), *hits] if distance >= after}
+
+
+def test_ties_come_in_id_order(index):
+    index, query = index
+    hits = index.search(query, 3)
+    assert [document_id for document_id, _ in hits] == [1, 2, 3]
+    assert hits[0][1] == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 10])
+def test_keyset_paging_returns_every_document_once(index, limit):
+    index, query = index
+    ids = walk(index, query, limit)
+    assert sorted(ids) == list(range(1, 11))
+    assert ids[:5] == [1, 2, 3, 4, 5]
+
+
+def test_allowed_ids(index):
+    index, query = index
+    assert sorted(walk(index, query, 2, allowed_ids=[2, 4, 8])) == [2, 4, 8]
+
+
+def test_skip_matches_keyset(index):
+    index, query = index
+    ranked = [document_id for document_id, _ in index.search(query, 10)]
+    assert [document_id for document_id, _ in index.search(query, 3, skip=3)] == ranked[3:6]
@@ -7,4 +7,4 @@
 alembic upgrade head
 
 # Start the backend
-uvicorn app.main:app --host 0.0.0.0 --port 80 --workers 10
\ No newline at end of file
+exec gunicorn -c gunicorn.conf.py --bind 0.0.0.0:80 app.main:app
\ No newline at end of file